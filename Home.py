@@ -1,17 +1,85 @@
-import datetime as dt
-from email.mime import image
+import os
+import time
+from contextlib import contextmanager
+
 import streamlit as st
-from PIL import Image
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.subplots as sp
-from dateutil import parser
+
+from dashboard import assets, profiling
+from dashboard.downsample import POINT_BUDGET, window
+from dashboard.fetch import OFFLINE, PAGE_TIMEOUT, Unavailable, collect, prefetch, warm
+from dashboard.figures import chart
+from dashboard.price import RANGES, near_price_series
+from dashboard.queries import SECTIONS, TABS
+from dashboard.rollup import BUCKETS, rollup
+from dashboard.scheduler import RefreshScheduler
 
 
 theme_plotly = None
 
-st.set_page_config(page_title='NEAR Mega Dashboard', page_icon= 'Images/near-logo.png', layout='wide')
+st.set_page_config(page_title='NEAR Mega Dashboard', page_icon=assets.image('near-logo.png'), layout='wide')
+
+
+@st.cache_resource
+def refresh_scheduler():
+    scheduler = RefreshScheduler()
+    scheduler.start()
+    return scheduler
+
+
+if not OFFLINE:
+    refresh_scheduler()
+
+
+def plot(fig):
+    with profiling.panel_timed('render'):
+        st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
+
+
+def zoom(frame, column, key):
+    """Let the user narrow a series too long to chart at full resolution to a window of ``column``."""
+    if len(frame) <= POINT_BUDGET:
+        return frame
+    first = frame[column].iloc[0].to_pydatetime()
+    last = frame[column].iloc[-1].to_pydatetime()
+    selected = st.session_state.get(key)
+    if selected is not None and not first <= selected[0] <= selected[1] <= last:
+        # The data was refreshed or rolled up differently since the window was picked.
+        del st.session_state[key]
+    start, end = st.slider(
+        'Zoom into a time window to see it in more detail',
+        min_value=first,
+        max_value=last,
+        value=(first, last),
+        step=(frame[column].iloc[1] - frame[column].iloc[0]).to_pytimedelta(),
+        key=key,
+    )
+    return window(frame, column, start, end)
+
+
+@contextmanager
+def panel(name):
+    """Attribute what the block renders to panel ``name``, and degrade it to a warning if its data did not load."""
+    profiling.start_panel(name)
+    try:
+        yield
+    except Unavailable as error:
+        st.warning(f'{name} is unavailable: the {error} query could not be loaded from Flipside. It will be back once the query recovers.')
+    finally:
+        profiling.end_panel()
+
+
+active_tab = st.session_state.get('active_tab', next(iter(TABS)))
+# One deadline for the whole run: the price section and the open tab share
+# PAGE_TIMEOUT, and a slow query only holds back the section that needs it.
+deadline = time.monotonic() + PAGE_TIMEOUT
+pending = prefetch(SECTIONS['price'] + SECTIONS[TABS[active_tab]])
+
+
+def collect_section(section):
+    futures = pending if all(name in pending for name in SECTIONS[section]) else prefetch(SECTIONS[section])
+    return collect({name: futures[name] for name in SECTIONS[section]}, timeout=max(0, deadline - time.monotonic()))
+
+
 st.title('NEAR Mega Dashboard')
 st.markdown(
     """
@@ -22,7 +90,7 @@ st.markdown(
     unsafe_allow_html=True,
 )
 c1, c2 = st.columns(2)
-c1.image(Image.open('Images/NEAR-Protocol.png'))
+c1.image(assets.image('NEAR-Protocol.png'))
 c2.subheader('What is NEAR?')
 c2.write(
     """
@@ -39,40 +107,33 @@ c2.write(
     real-world events, and more.
     """
 )
-st.subheader('Price Chart')
-c1, c2 = st.columns([1,3])
-with c1:
-    current_price = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/6b0abb21-08e5-4aff-860b-7881ab5213ee/data/latest')
-    st.metric(label='**Current Price**', value=str(current_price['HOURLY_PRICE'].values[0]), help='USD')
-with c2:
-    time_range = st.selectbox(
-        'Select the time range',
-        [
-            "All Time", "24 Hours", "7 Days", "30 Days", "90 Days", "1 Year"
-        ],
-        key="select_timerange",
-    )
+data = collect_section('price')
+
+
+# The interactive panels are fragments: changing one of their widgets reruns
+# only that panel, over the data the last full run collected.
+@st.fragment
+def price_panel(data):
+    with panel('Price Chart'):
+        st.subheader('Price Chart')
+        c1, c2 = st.columns([1,3])
+        with c1:
+            current_price = data['current_price']
+            st.metric(label='**Current Price**', value=str(current_price['HOURLY_PRICE'].values[0]), help=' '.join(filter(None, ['USD.', data.as_of('current_price')])))
+        with c2:
+            time_range = st.selectbox(
+                'Select the time range',
+                list(RANGES),
+                key="select_timerange",
+            )
 
-hourly_price = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/a0ffdf60-8fb8-4305-bd7e-985c9cfbfd08/data/latest')
-df = hourly_price.query("BLOCKCHAIN == 'NEAR'")
-df['HOUR'] = pd.to_datetime(df['HOUR'])
-
-if time_range == "All Time":
-    df = df
-elif time_range == "24 Hours":
-    df = df[ df['HOUR'] >= (dt.datetime.now()-pd.Timedelta(hours=24))]
-elif time_range == "7 Days":
-    df = df[ df['HOUR'] >= (dt.datetime.now()-pd.Timedelta(days=7))]
-elif time_range == "30 Days":
-    df = df[ df['HOUR'] >= (dt.datetime.now()-pd.Timedelta(days=30))]
-elif time_range == "90 Days":
-    df = df[ df['HOUR'] >= (dt.datetime.now()-pd.Timedelta(days=90))]
-elif time_range == "1 Year":
-    df = df[ df['HOUR'] >= (dt.datetime.now()-pd.Timedelta(days=365))]
-
-fig = px.line(df, x='HOUR', y='HOURLY_PRICE', title='Hourly Price Trend of NEAR')
-fig.update_layout(legend_title=None, xaxis_title='Hour', yaxis_title='Price (in $)')
-st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
+        df = near_price_series('hourly_price', data['hourly_price']).window(time_range)
+
+        fig = chart('line', df, x='HOUR', y='HOURLY_PRICE', title='Hourly Price Trend of NEAR', max_points=POINT_BUDGET, layout=dict(legend_title=None, xaxis_title='Hour', yaxis_title='Price (in $)'))
+        plot(fig)
+
+
+price_panel(data)
 
 st.header("Methodology")
 with st.expander("Method details and data sources"):
@@ -93,155 +154,171 @@ with st.expander("Method details and data sources"):
         """
     )
 
-tab4, tab3, tab2, tab1 = st.tabs(
-    [
-        "**Metrics**",
-        "**Swaps**",
-        "**GAS & Fees**",
-        "**Staking**"
-    ]
-)
 
-with tab4:
-    st.write(
-        """
-        Blockchain metrics are used to measure the quality, performance and scalability of 
-        blockchain applications and to establish benchmarks for different versions of blockchain 
-        applications to be compared against each other.
-        
-        The following are common metrics, all of which are measured at runtime, while the blockchain application is active.
-        """
-    )
-    st.subheader("Active Nodes")
-    st.write(
-        """
-        Also known as Active Addresses, this metric is measured by collecting and recording 
-        how many unique nodes are active during a predetermined time span, such as per day, 
-        per week or per month. In permissionless blockchains, the greater the number, the greater 
-        the indication that more nodes are using and trusting the blockchain application. 
-        \n
-        """
-    )
-    c1, c2 = st.columns([1,3])
-    with c1:
-        total_active_nodes = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/43656c5e-7d7b-4986-b03f-fd114ca4b1d5/data/latest')
-        st.metric(label='**Total Unique Nodes**', value=str(total_active_nodes['TOTAL_NODES_COUNT'].values[0]))
-    with c2:
-        time_span = st.selectbox(
-            'Select the time span to view the Active Nodes over Time',
-            [
-                "By Day", "By Week", "By Month"
-            ],
-            key="select_timespan_nodes",
+@st.fragment
+def active_nodes_panel(data):
+    with panel('Active Nodes'):
+        st.subheader("Active Nodes")
+        st.write(
+            """
+            Also known as Active Addresses, this metric is measured by collecting and recording 
+            how many unique nodes are active during a predetermined time span, such as per day, 
+            per week or per month. In permissionless blockchains, the greater the number, the greater 
+            the indication that more nodes are using and trusting the blockchain application. 
+            \n
+            """
+        )
+        c1, c2 = st.columns([1,3])
+        with c1:
+            total_active_nodes = data['total_active_nodes']
+            st.metric(label='**Total Unique Nodes**', value=str(total_active_nodes['TOTAL_NODES_COUNT'].values[0]), help=data.as_of('total_active_nodes'))
+        with c2:
+            time_span = st.selectbox(
+                'Select the time span to view the Active Nodes over Time',
+                [
+                    "By Day", "By Week", "By Month"
+                ],
+                key="select_timespan_nodes",
+            )
+        if time_span == "By Day":
+            active_nodes = data['active_nodes_by_day']
+        elif time_span == "By Week":
+            active_nodes = data['active_nodes_by_week']
+        elif time_span == "By Month":
+            active_nodes = data['active_nodes_by_month']
+        fig = chart('bar', active_nodes, title='Number of Active Nodes over selected Time', x='DAY', y='NO_OF_ACTIVE_NODES', layout=dict(legend_title=None, xaxis_title='Time', yaxis_title='Active Nodes'))
+        plot(fig)
+
+
+@st.fragment
+def blocks_panel(data):
+    with panel('Blocks per Hour/Day'):
+        st.subheader("Blocks per Hour/Day")
+        st.write(
+            """
+            These metrics measure the speed at which records are submitted and stored on the 
+            blockchain network and how fast the network can carry out its consensus algorithm. 
+            Because the capacity of a block is fixed, the quantity of blocks processed can be 
+            calculated accordingly.
+
+            Every block that is created has a timestamp (as per the timestamp header covered earlier 
+            in the Understanding Blocks and Chains section). Via the use of timestamps, the blockchain 
+            system can measure how many blocks are created and added during specified time periods, 
+            such as per hour or per day. The results of these measurements help assess the performance 
+            and scalability of the blockchain system. 
+            \n
+            """
+        )
+        c1, c2 = st.columns([1,3])
+        with c1:
+            total_blocks = data['total_blocks']
+            st.metric(label='**Total Blocks Created**', value=str(total_blocks['TOTAL_BLOCKS_COUNT'].values[0]), help=data.as_of('total_blocks'))
+        with c2:
+            time_span = st.selectbox(
+                'Select the time span to view the Blocks created over Time',
+                list(BUCKETS),
+                key="select_timespan_blocks",
+            )
+        # Hours come from the hourly query; days and coarser from the daily one,
+        # which reaches back further than the hourly window.
+        if time_span == "By Hour":
+            blocks_rollup = rollup('blocks_by_hour', data['blocks_by_hour'], 'TIME', ['TOTAL_BLOCKS_COUNT'], "By Hour")
+        else:
+            blocks_rollup = rollup('blocks_by_day', data['blocks_by_day'], 'TIME', ['TOTAL_BLOCKS_COUNT'], "By Day")
+        blocks = zoom(blocks_rollup(time_span), 'TIME', key=f'zoom_blocks_{time_span}')
+        fig = chart('bar', blocks, title='Number of Blocks created over Time', x='TIME', y='TOTAL_BLOCKS_COUNT', max_points=POINT_BUDGET, layout=dict(legend_title=None, xaxis_title='Time', yaxis_title='# of Blocks'))
+        plot(fig)
+        st.caption(f"{blocks['TOTAL_BLOCKS_COUNT'].sum():,} blocks in the charted period")
+
+
+@st.fragment
+def tps_panel(data):
+    with panel('Transactions Per Second'):
+        st.subheader("Transactions Per Second")
+        st.write(
+            """
+            This metric is used to measure the quantity of records or transaction records 
+            submitted and stored per second. It is used to assess the volume of processing 
+            a blockchain network is undergoing and to judge its scalability requirements. 
+            The quantity of records submitted to the network and the quantity of records stored 
+            to the ledger are generally measured separately. 
+            \n
+            """
         )
-    active_nodes = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/9cb68077-5821-4e26-8d4b-aa57421d4a1f/data/latest')
-    if time_span == "By Day":
-        active_nodes = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/9cb68077-5821-4e26-8d4b-aa57421d4a1f/data/latest')
-    elif time_span == "By Week":
-        active_nodes = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/0a88df20-d8e6-41d3-b5db-7afb983d2716/data/latest')
-    elif time_span == "By Month":
-        active_nodes = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/e1c1835b-9033-4455-b787-aeaa0ff9cf84/data/latest')
-    fig = px.bar(active_nodes,title='Number of Active Nodes over selected Time', x=active_nodes['DAY'], y=active_nodes['NO_OF_ACTIVE_NODES'])
-    fig.update_layout(legend_title=None, xaxis_title='Time', yaxis_title='Active Nodes')
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-
-    st.subheader("New Nodes")
-    new_nodes = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/3b4a99c8-8bc0-476d-82ed-a78a60242e15/data/latest')
-    fig = px.line(new_nodes, x="Join date", y="Cumulative", title="Number of New Nodes vs Cumulative New Nodes", log_y=True)
-    fig.add_trace(go.Bar(x=new_nodes["Join date"], y=new_nodes["New Wallets"]))
-    fig.update_layout(showlegend=False, legend_title=None, xaxis_title='DATE', yaxis_title='Number of Nodes')
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-    
 
-    st.subheader("Blocks per Hour/Day")
-    st.write(
-        """
-        These metrics measure the speed at which records are submitted and stored on the 
-        blockchain network and how fast the network can carry out its consensus algorithm. 
-        Because the capacity of a block is fixed, the quantity of blocks processed can be 
-        calculated accordingly.
-
-        Every block that is created has a timestamp (as per the timestamp header covered earlier 
-        in the Understanding Blocks and Chains section). Via the use of timestamps, the blockchain 
-        system can measure how many blocks are created and added during specified time periods, 
-        such as per hour or per day. The results of these measurements help assess the performance 
-        and scalability of the blockchain system. 
-        \n
-        """
-    )
-    c1, c2 = st.columns([1,3])
-    with c1:
-        total_blocks = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/29b93124-ae51-42b7-8db9-5829e8792a95/data/latest')
-        st.metric(label='**Total Blocks Created**', value=str(total_blocks['TOTAL_BLOCKS_COUNT'].values[0]))
-    with c2:
+        c1, c2 = st.columns([1,1])
+        with c1:
+            total_trans = data['total_trans']
+            st.metric(label='**Total Number of Transactions**', value=str(total_trans['TOTAL_NO_OF_TRANS'].values[0]), help=data.as_of('total_trans'))
+        with c2:
+            total_tps = data['total_tps']
+            st.metric(label='**Transactions Per Second (TPS)**', value=str(total_trans['TPS'].values[0]), help=data.as_of('total_trans'))
+
+    
         time_span = st.selectbox(
-            'Select the time span to view the Blocks created over Time',
-            [
-                "By Hour", "By Day",
-            ],
-            key="select_timespan_blocks",
+            'Select the time span to view the Transactions over Time',
+            ["By Day", "By Week", "By Month"],
+            key="select_timespan_trans",
+        )
+        trans_rollup = rollup('trans_per_day', data['trans_per_day'], 'DAY', ['NO_OF_TRANS'], "By Day")
+        trans_per_day = zoom(trans_rollup(time_span), 'DAY', key=f'zoom_trans_{time_span}')
+        fig = chart('line', trans_per_day, x='DAY', y='NO_OF_TRANS', title='Number of Transactions over Time', max_points=POINT_BUDGET, layout=dict(legend_title=None, xaxis_title=time_span.split()[1], yaxis_title="# Number of Transactions"))
+        plot(fig)
+        st.caption(f"{trans_per_day['NO_OF_TRANS'].sum():,} transactions in the charted period")
+
+        tps_per_day = zoom(data['tps_per_day'], 'DAY', key='zoom_tps')
+        fig = chart('bar', tps_per_day, x='DAY', y='TPS', title='Daily TPS', max_points=POINT_BUDGET, layout=dict(legend_title=None, xaxis_title='Day', yaxis_title="TPS"))
+        plot(fig)
+
+
+@st.fragment
+def latency_panel(data):
+    with panel('Transaction Latency'):
+        st.subheader("Transaction Latency")
+        st.write(
+            """
+            This metric is used to measure the time from which a transaction is submitted to the 
+            network until the time that the transaction has been written to the ledger (or rejected). 
+            This metric is measured by checking the timestamp of transactions and comparing the time 
+            they were submitted to the time they were validated and stored. This metric can also 
+            provide insight as to how fast consensus algorithms are being carried out. 
+            \n
+            """
         )
-    blocks = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/67cdef00-309f-4383-bcfd-485cb5c47f0b/data/latest')
-    if time_span == "By Hour":
-        blocks = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/67cdef00-309f-4383-bcfd-485cb5c47f0b/data/latest')
-    elif time_span == "By Day":
-        blocks = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/5b87550e-ae9c-4950-9c27-c8bc884f7cdc/data/latest')
-    fig = px.bar(blocks,title='Number of Blocks created over Time', x=blocks['TIME'], y=blocks['TOTAL_BLOCKS_COUNT'])
-    fig.update_layout(legend_title=None, xaxis_title='Time', yaxis_title='# of Blocks')
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-
-    st.subheader("Transactions Per Second")
-    st.write(
-        """
-        This metric is used to measure the quantity of records or transaction records 
-        submitted and stored per second. It is used to assess the volume of processing 
-        a blockchain network is undergoing and to judge its scalability requirements. 
-        The quantity of records submitted to the network and the quantity of records stored 
-        to the ledger are generally measured separately. 
-        \n
-        """
-    )
 
-    c1, c2 = st.columns([1,1])
-    with c1:
-        total_trans = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/decb895c-c1b5-45b2-b8f1-4c3911e0175b/data/latest')
-        st.metric(label='**Total Number of Transactions**', value=str(total_trans['TOTAL_NO_OF_TRANS'].values[0]))
-    with c2:
-        total_tps = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/decb895c-c1b5-45b2-b8f1-4c3911e0175b/data/latest')
-        st.metric(label='**Transactions Per Second (TPS)**', value=str(total_trans['TPS'].values[0]))
+        avg_latency = data['avg_latency']
+        st.metric(label='**Average Transaction Latency**', value=str(avg_latency['LATENCY'].values[0]), help=data.as_of('avg_latency'))
 
-    
-    trans_per_day = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/876aa346-8b81-4f88-8d79-c0329e30db9f/data/latest')
-    fig = px.line(trans_per_day, x='DAY', y='NO_OF_TRANS', title='Daily Number of Transactions')
-    fig.update_layout(legend_title=None, xaxis_title='Day', yaxis_title="# Number of Transactions")
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
+        latency_per_day = zoom(data['latency_per_day'], 'DAY', key='zoom_latency')
+        fig = chart('bar', latency_per_day, x='DAY', y='LATENCY', title='Daily Transaction Latency', max_points=POINT_BUDGET, layout=dict(legend_title=None, xaxis_title='Day', yaxis_title="Latency"))
+        plot(fig)
 
-    tps_per_day = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/876aa346-8b81-4f88-8d79-c0329e30db9f/data/latest')
-    fig = px.bar(tps_per_day, x='DAY', y='TPS', title='Daily TPS')
-    fig.update_layout(legend_title=None, xaxis_title='Day', yaxis_title="TPS")
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
 
-    st.subheader("Transaction Latency")
+def metrics_tab(data):
     st.write(
         """
-        This metric is used to measure the time from which a transaction is submitted to the 
-        network until the time that the transaction has been written to the ledger (or rejected). 
-        This metric is measured by checking the timestamp of transactions and comparing the time 
-        they were submitted to the time they were validated and stored. This metric can also 
-        provide insight as to how fast consensus algorithms are being carried out. 
-        \n
+        Blockchain metrics are used to measure the quality, performance and scalability of 
+        blockchain applications and to establish benchmarks for different versions of blockchain 
+        applications to be compared against each other.
+        
+        The following are common metrics, all of which are measured at runtime, while the blockchain application is active.
         """
     )
+    active_nodes_panel(data)
 
-    avg_latency = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/e2a0f2fb-03fb-462d-9d3c-f1cdfd993bf4/data/latest')
-    st.metric(label='**Average Transaction Latency**', value=str(avg_latency['LATENCY'].values[0]))
+    with panel('New Nodes'):
+        st.subheader("New Nodes")
+        new_nodes = data['new_nodes']
+        fig = chart('line', new_nodes, x="Join date", y="Cumulative", title="Number of New Nodes vs Cumulative New Nodes", log_y=True, traces=[dict(type='Bar', x='Join date', y='New Wallets')], layout=dict(showlegend=False, legend_title=None, xaxis_title='DATE', yaxis_title='Number of Nodes'))
+        plot(fig)
+    
+
+    blocks_panel(data)
 
-    latency_per_day = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/1e22c399-612f-4d8b-8134-c029eaa846a8/data/latest')
-    fig = px.bar(latency_per_day, x='DAY', y='LATENCY', title='Daily Transaction Latency')
-    fig.update_layout(legend_title=None, xaxis_title='Day', yaxis_title="Latency")
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
+    tps_panel(data)
+    latency_panel(data)
 
-with tab3:
+def swaps_tab(data):
     st.write(
         """
         Swap facilitates the instant exchange of two non-native tokens between two unique 
@@ -253,66 +330,84 @@ with tab3:
         """
     )
 
-    c1, c2 = st.columns([1,1])
-    total_swaps = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/e27380a3-b603-4eef-ab5f-1bb0a3ed2255/data/latest')
-    with c1:
-        st.metric(label='**Total Number of Swaps**', value=str(total_swaps['TOTAL_SWAPS'].values[0]))
-    with c2:
-        st.metric(label='**Total Number of Unique Traders**', value=str(total_swaps['NO_OF_SWAPPERS'].values[0]))
-
-    swap_activity = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/6b8977d0-da7e-404c-bc80-07b45b6e223b/data/latest')
-    fig = px.bar(swap_activity, x="DAY", y=["TOTAL_SWAPS", "NO_OF_SWAPPERS"], title="Swap Metrics over Time")
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-
-    c1, c2 = st.columns([1,1])
-    with c1:
-        top_traders_1 = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/e13bdb4f-4590-4420-a3d3-2e120326c292/data/latest')
-        fig = px.pie(top_traders_1, values='NO_OF_SWAPS', names='SWAPPER', title='Top Swappers by Swaps Count')
-        fig.update_layout(showlegend = False)
-        st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-
-    with c2:
-        top_traders_2 = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/1e8af9f9-5fd0-4411-85b8-104f10cbd82a/data/latest')
-        fig = px.pie(top_traders_2, values='TOTAL_SWAP_IN_VOLUME_USD', names='SWAPPER', title='Top Swappers by Swap Volume')
-        fig.update_layout(showlegend = False)
-        st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
+    with panel('Swap Totals'):
+        c1, c2 = st.columns([1,1])
+        total_swaps = data['total_swaps']
+        with c1:
+            st.metric(label='**Total Number of Swaps**', value=str(total_swaps['TOTAL_SWAPS'].values[0]), help=data.as_of('total_swaps'))
+        with c2:
+            st.metric(label='**Total Number of Unique Traders**', value=str(total_swaps['NO_OF_SWAPPERS'].values[0]), help=data.as_of('total_swaps'))
+
+    with panel('Swap Metrics over Time'):
+        swap_activity = data['swap_activity']
+        fig = chart('bar', swap_activity, x="DAY", y=["TOTAL_SWAPS", "NO_OF_SWAPPERS"], title="Swap Metrics over Time")
+        plot(fig)
+
+    with panel('Top Swappers'):
+        c1, c2 = st.columns([1,1])
+        with c1:
+            top_traders_1 = data['top_traders_1']
+            fig = chart('pie', top_traders_1, values='NO_OF_SWAPS', names='SWAPPER', title='Top Swappers by Swaps Count', layout=dict(showlegend=False))
+            plot(fig)
+
+        with c2:
+            top_traders_2 = data['top_traders_2']
+            fig = chart('pie', top_traders_2, values='TOTAL_SWAP_IN_VOLUME_USD', names='SWAPPER', title='Top Swappers by Swap Volume', layout=dict(showlegend=False))
+            plot(fig)
     
-    st.subheader("SWAPs of NEAR Token")
-    c1, c2 = st.columns([1,1])
-    near_swaps = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/4c5dbb8e-3d3a-4ecf-a245-c7e36b92f4ea/data/latest')
-    with c1:
-        st.metric(label='**Total Number of Swaps IN**', value=str(near_swaps['NO_OF_SWAPS_IN'].values[0]))
-    with c2:
-        st.metric(label='**Total Number of Swaps OUT**', value=str(near_swaps['NO_OF_SWAPS_OUT'].values[0]))
+    with panel('SWAPs of NEAR Token'):
+        st.subheader("SWAPs of NEAR Token")
+        c1, c2 = st.columns([1,1])
+        near_swaps = data['near_swaps']
+        with c1:
+            st.metric(label='**Total Number of Swaps IN**', value=str(near_swaps['NO_OF_SWAPS_IN'].values[0]), help=data.as_of('near_swaps'))
+        with c2:
+            st.metric(label='**Total Number of Swaps OUT**', value=str(near_swaps['NO_OF_SWAPS_OUT'].values[0]), help=data.as_of('near_swaps'))
     
-    c1, c2 = st.columns([1,1])
-    near_swaps_volume = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/b0d1bded-7b96-4c72-b68f-5142044a38cf/data/latest')
-    with c1:
-        st.metric(label='**Total Swap IN Volume**', value=str(near_swaps_volume['SWAP_IN_VOLUME_USD'].values[0]))
-    with c2:
-        st.metric(label='**Total Swap OUT Volume**', value=str(near_swaps_volume['SWAP_OUT_VOLUME_USD'].values[0]))
+        c1, c2 = st.columns([1,1])
+        near_swaps_volume = data['near_swaps_volume']
+        with c1:
+            st.metric(label='**Total Swap IN Volume**', value=str(near_swaps_volume['SWAP_IN_VOLUME_USD'].values[0]), help=data.as_of('near_swaps_volume'))
+        with c2:
+            st.metric(label='**Total Swap OUT Volume**', value=str(near_swaps_volume['SWAP_OUT_VOLUME_USD'].values[0]), help=data.as_of('near_swaps_volume'))
     
-    c1, c2 = st.columns([1,1])
-    near_swappers = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/fc89e9b0-26d3-491e-b3d8-2351138e9b87/data/latest')
-    with c1:
-        st.metric(label='**Number of Swappers who swapped into the NEAR**', value=str(near_swappers['NO_OF_SWAPPERS_IN'].values[0]))
-    with c2:
-        st.metric(label='**Number of Swappers who swapped out the NEAR**', value=str(near_swappers['NO_OF_SWAPPERS_OUT'].values[0]))
+        c1, c2 = st.columns([1,1])
+        near_swappers = data['near_swappers']
+        with c1:
+            st.metric(label='**Number of Swappers who swapped into the NEAR**', value=str(near_swappers['NO_OF_SWAPPERS_IN'].values[0]), help=data.as_of('near_swappers'))
+        with c2:
+            st.metric(label='**Number of Swappers who swapped out the NEAR**', value=str(near_swappers['NO_OF_SWAPPERS_OUT'].values[0]), help=data.as_of('near_swappers'))
     
-    c1, c2 = st.columns([1,1])
-    with c1:
-        top_near_swappers_1 = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/e0fefd99-8536-433f-9c83-fad067a3e2f5/data/latest')
-        fig = px.pie(top_near_swappers_1, values='SWAP_IN_VOLUME_USD', names='SWAPPER', title='Top Swappers who Swapped into the NEAR by Volume (in $)')
-        fig.update_layout(showlegend = False)
-        st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
+    with panel('Top NEAR Swappers'):
+        c1, c2 = st.columns([1,1])
+        with c1:
+            top_near_swappers_1 = data['top_near_swappers_1']
+            fig = chart('pie', top_near_swappers_1, values='SWAP_IN_VOLUME_USD', names='SWAPPER', title='Top Swappers who Swapped into the NEAR by Volume (in $)', layout=dict(showlegend=False))
+            plot(fig)
+
+        with c2:
+            top_near_swappers_2 = data['top_near_swappers_2']
+            fig = chart('pie', top_near_swappers_2, values='SWAP_OUT_VOLUME_USD', names='SWAPPER', title='Top Swappers who Swapped out the NEAR by Volume (in $)', layout=dict(showlegend=False))
+            plot(fig)
+
+
+@st.fragment
+def fees_over_time_panel(data):
+    with panel('Fees and GAS over Time'):
+        time_span = st.selectbox(
+            'Select the time span to view the Fees and GAS over Time',
+            ["By Week", "By Month"],
+            key="select_timespan_fees",
+        )
+        fees = rollup('fees', data['fees'], 'DAY', ['TOTAL_TRANS_FEE_USD', 'TOTAL_GAS_USED'], "By Week")(time_span)
+        fig = chart('bar', fees, title=f'Total Transaction Fees per {time_span.split()[1]}', x='DAY', y='TOTAL_TRANS_FEE_USD', layout=dict(legend_title=None, xaxis_title='Time', yaxis_title='Total Transaction Fee (in $)'))
+        plot(fig)
+
+        fig = chart('bar', fees, title=f'Total GAS Used per {time_span.split()[1]}', x='DAY', y='TOTAL_GAS_USED', layout=dict(legend_title=None, xaxis_title='Time', yaxis_title='Total GAS USed (in $)'))
+        plot(fig)
 
-    with c2:
-        top_near_swappers_2 = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/1cc3e8ed-b59c-465d-8669-635e6fb53338/data/latest')
-        fig = px.pie(top_near_swappers_2, values='SWAP_OUT_VOLUME_USD', names='SWAPPER', title='Top Swappers who Swapped out the NEAR by Volume (in $)')
-        fig.update_layout(showlegend = False)
-        st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
 
-with tab2:
+def fees_tab(data):
     st.subheader("What is Transaction Fees?")
     st.write(
         """
@@ -340,39 +435,50 @@ with tab2:
         other blockchains.
         """
     )
-    c1, c2, c3 = st.columns([1,1,1])
-    near_fees = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/de67356b-c2fa-4d8f-b594-11076d303964/data/latest')
-    with c1:
-        st.metric(label='**Total Transaction Fee (in NEAR)**', value=str(near_fees['TOTAL_TRANSACTION_FEE'].values[0]))
-    with c2:
-        st.metric(label='**Total Transaction Fee (in $)**', value=str(near_fees['TOTAL_TRANS_FEE_USD'].values[0]))
-    with c3:
-        st.metric(label='**Total GAS Used**', value=str(near_fees['TOTAL_GAS_USED'].values[0]))
+    with panel('Fee Totals'):
+        c1, c2, c3 = st.columns([1,1,1])
+        near_fees = data['near_fees']
+        with c1:
+            st.metric(label='**Total Transaction Fee (in NEAR)**', value=str(near_fees['TOTAL_TRANSACTION_FEE'].values[0]), help=data.as_of('near_fees'))
+        with c2:
+            st.metric(label='**Total Transaction Fee (in $)**', value=str(near_fees['TOTAL_TRANS_FEE_USD'].values[0]), help=data.as_of('near_fees'))
+        with c3:
+            st.metric(label='**Total GAS Used**', value=str(near_fees['TOTAL_GAS_USED'].values[0]), help=data.as_of('near_fees'))
     
-    fees = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/2100bcb8-3a86-425f-a189-8491ba61b513/data/latest')
-    fig = px.bar(fees,title='Total Transaction Fees per Week', x=fees['DAY'], y=fees['TOTAL_TRANS_FEE_USD'])
-    fig.update_layout(legend_title=None, xaxis_title='Time', yaxis_title='Total Transaction Fee (in $)')
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-
-    fig = px.bar(fees,title='Total GAS Used per Week', x=fees['DAY'], y=fees['TOTAL_GAS_USED'])
-    fig.update_layout(legend_title=None, xaxis_title='Time', yaxis_title='Total GAS USed (in $)')
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-
-    c1, c2 = st.columns([1,1])
-    avg_fee_per_tx = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/b3e9b66b-84ce-4b01-ac8e-7de2d34cf48f/data/latest')
-    with c1:
-        st.metric(label='**Average Transaction Fee per Transaction (in $)**', value=str(avg_fee_per_tx['AVG_FEE_PER_TX'].values[0]))
-    with c2:
-        st.metric(label='**Average Transaction Fee per User (in $)**', value=str(avg_fee_per_tx['AVG_FEE_PER_TRADER'].values[0]))
-
-    daily_fees = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/b99f37d4-9fd6-4205-99cd-a13f93602e58/data/latest')
-    fig = px.line(daily_fees, x="DAY", y=["AVG_FEE_PER_TX", "AVG_FEE_PER_TRADER"], title="Average Transaction Fee per Transaction on Weekly basis", log_y=True)
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-
-    # fig = px.line(daily_fees, x="DAY", y="AVG_FEE_PER_TRADER", title="Average Transaction Fee per Trader on Weekly basis")
-    # st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-
-with tab1:
+    fees_over_time_panel(data)
+
+    with panel('Average Fees'):
+        c1, c2 = st.columns([1,1])
+        avg_fee_per_tx = data['avg_fee_per_tx']
+        with c1:
+            st.metric(label='**Average Transaction Fee per Transaction (in $)**', value=str(avg_fee_per_tx['AVG_FEE_PER_TX'].values[0]), help=data.as_of('avg_fee_per_tx'))
+        with c2:
+            st.metric(label='**Average Transaction Fee per User (in $)**', value=str(avg_fee_per_tx['AVG_FEE_PER_TRADER'].values[0]), help=data.as_of('avg_fee_per_tx'))
+
+        daily_fees = data['daily_fees']
+        fig = chart('line', daily_fees, x="DAY", y=["AVG_FEE_PER_TX", "AVG_FEE_PER_TRADER"], title="Average Transaction Fee per Transaction on Weekly basis", log_y=True)
+        plot(fig)
+
+        # fig = px.line(daily_fees, x="DAY", y="AVG_FEE_PER_TRADER", title="Average Transaction Fee per Trader on Weekly basis")
+        # plot(fig)
+
+
+@st.fragment
+def stakes_over_time_panel(data):
+    with panel('Stakes/Unstakes over Time'):
+        time_span = st.selectbox(
+            'Select the time span to view the Stakes/Unstakes over Time',
+            ["By Week", "By Month"],
+            key="select_timespan_stakes",
+        )
+        stakes_over_time = rollup('stakes_over_time', data['stakes_over_time'], 'DATE', ['TX_COUNT', 'VOLUME'], "By Week", by=['ACTION'])(time_span)
+        fig = chart('bar', stakes_over_time, x='DATE', y='TX_COUNT', color='ACTION', title=f'Number of Stakes/Unstakes per {time_span.split()[1]}', layout=dict(showlegend=False, xaxis_title=time_span.split()[1].upper(), yaxis_title='Stakes/Unstakes'))
+        plot(fig)
+        fig = chart('bar', stakes_over_time, x='DATE', y='VOLUME', color='ACTION', title=f'Staking/Unstaking Volume per {time_span.split()[1]}', layout=dict(showlegend=False, xaxis_title=time_span.split()[1].upper(), yaxis_title='Staking Volume'))
+        plot(fig)
+
+
+def staking_tab(data):
     st.subheader("What is Staking?")
     st.write(
         """
@@ -408,53 +514,60 @@ with tab1:
         """
     )
     
-    c1,c2 = st.columns([1,1])
-    with c1:
-        total_pools = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/3ea466a6-6f61-4893-8a09-38bec66030ef/data/latest')
-        st.metric(label='**Total Number of Staking Pools**', value=str(total_pools['TOTAL_NO_OF_POOLS'].values[0]))
-    with c2:
-        validators = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/80ce068a-dcc9-42e3-bd84-fee610dbba09/data/latest')
-        st.metric(label='**Total Number of Validators**', value=str(validators['NO_OF_VALIDATORS'].values[0]))
+    with panel('Staking Pools'):
+        c1,c2 = st.columns([1,1])
+        with c1:
+            total_pools = data['total_pools']
+            st.metric(label='**Total Number of Staking Pools**', value=str(total_pools['TOTAL_NO_OF_POOLS'].values[0]), help=data.as_of('total_pools'))
+        with c2:
+            validators = data['validators']
+            st.metric(label='**Total Number of Validators**', value=str(validators['NO_OF_VALIDATORS'].values[0]), help=data.as_of('validators'))
     
-    c1,c2,c3 = st.columns([1,1,1])
-    pools = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/80ce068a-dcc9-42e3-bd84-fee610dbba09/data/latest')
-    with c1:
-        st.metric(label='**Minimum Size of the Pool**', value=str(pools['MIN_POOL'].values[0]))
-    with c2:
-        st.metric(label='**Maximum Size of the Pool**', value=str(pools['MAX_POOL'].values[0]))
-    with c3:
-        st.metric(label='**Median Size of the Pool**', value=str(pools['MEDIAN_POOL'].values[0]))
-
-
-    c1,c2 = st.columns([1,1])
-    with c1:
-        stakes = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/7e8e8862-c09d-441b-b135-42a985b284b9/data/latest')
-        fig = px.pie(stakes, values='TX_COUNT', names='ACTION', title='Total Number of Stakes/Unstakes')
-        fig.update_layout(showlegend = False)
-        st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-    with c2:
-        stakes = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/7e8e8862-c09d-441b-b135-42a985b284b9/data/latest')
-        fig = px.pie(stakes, values='VOLUME', names='ACTION', title='Statking/Unstaking Volume')
-        fig.update_layout(showlegend = False)
-        st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-    
-    stakes_over_time = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/44b84544-01f0-4489-8c34-18578a28f838/data/latest')
-    fig = px.bar(stakes_over_time, x='DATE', y='TX_COUNT', color='ACTION', title='Number of Stakes/Unstakes on Weekly basis')
-    fig.update_layout(showlegend=False, xaxis_title='WEEK', yaxis_title='Stakes/Unstakes')
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-    fig = px.bar(stakes_over_time, x='DATE', y='VOLUME', color='ACTION', title='Staking/Unstaking Volume on Weekly basis')
-    fig.update_layout(showlegend=False, xaxis_title='WEEK', yaxis_title='Staking Volume')
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-
-    validators_over_time = pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/ff352b3d-ec72-4735-a563-7182990901a6/data/latest')
-    fig = px.line(validators_over_time, x="DATE", y="VALIDATOR", title="Number of Validators over Time")
-    fig.update_layout(xaxis_title='WEEK', yaxis_title='Number of Validators')
-    st.plotly_chart(fig, use_container_width=True, theme=theme_plotly)
-
-
-
-
-
-
-
+        c1,c2,c3 = st.columns([1,1,1])
+        pools = data['pools']
+        with c1:
+            st.metric(label='**Minimum Size of the Pool**', value=str(pools['MIN_POOL'].values[0]), help=data.as_of('pools'))
+        with c2:
+            st.metric(label='**Maximum Size of the Pool**', value=str(pools['MAX_POOL'].values[0]), help=data.as_of('pools'))
+        with c3:
+            st.metric(label='**Median Size of the Pool**', value=str(pools['MEDIAN_POOL'].values[0]), help=data.as_of('pools'))
+
+
+    with panel('Stakes/Unstakes'):
+        c1,c2 = st.columns([1,1])
+        with c1:
+            stakes = data['stakes']
+            fig = chart('pie', stakes, values='TX_COUNT', names='ACTION', title='Total Number of Stakes/Unstakes', layout=dict(showlegend=False))
+            plot(fig)
+        with c2:
+            stakes = data['stakes']
+            fig = chart('pie', stakes, values='VOLUME', names='ACTION', title='Statking/Unstaking Volume', layout=dict(showlegend=False))
+            plot(fig)
     
+    stakes_over_time_panel(data)
+
+    with panel('Validators over Time'):
+        validators_over_time = data['validators_over_time']
+        fig = chart('line', validators_over_time, x="DATE", y="VALIDATOR", title="Number of Validators over Time", layout=dict(xaxis_title='WEEK', yaxis_title='Number of Validators'))
+        plot(fig)
+
+
+tabs = st.tabs(list(TABS), key='active_tab', on_change='rerun')
+tab_renderers = {'metrics': metrics_tab, 'swaps': swaps_tab, 'fees': fees_tab, 'staking': staking_tab}
+for tab, section in zip(tabs, TABS.values()):
+    with tab:
+        if tab.open:
+            tab_renderers[section](collect_section(section))
+
+# Warm the hidden tabs in the background once the visible one has been rendered.
+warm(name for label, section in TABS.items() if label != active_tab for name in SECTIONS[section])
+
+if st.query_params.get('admin') == '1' or os.environ.get('NEAR_DASHBOARD_ADMIN'):
+    with st.sidebar:
+        st.header('Performance')
+        st.dataframe(profiling.stats(), hide_index=True)
+        st.subheader('Memory')
+        st.dataframe(profiling.memory(), hide_index=True, column_config={'used': st.column_config.ProgressColumn('used', min_value=0, max_value=1)})
+        st.download_button('Download events (JSONL)', profiling.recent_events(), file_name='profile.jsonl')
+        st.download_button('Download metrics (Prometheus)', profiling.prometheus(), file_name='metrics.prom')
+profiling.dump()
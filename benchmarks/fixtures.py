@@ -0,0 +1,126 @@
+"""Fixtures for the offline benchmarks: one JSON payload per registered query.
+
+    python -m benchmarks.fixtures record       # download every query from Flipside
+    python -m benchmarks.fixtures synthesize   # generate deterministic stand-ins
+    python -m benchmarks.fixtures check        # check recorded fixtures against the schemas
+
+Fixtures are written to ``benchmarks/fixtures/<query_id>.json``. Recorded
+payloads are the real thing; synthesized ones follow the declared schemas
+and are meant for machines without access to Flipside, so only ``check`` on
+recorded fixtures tells whether ``queries.SCHEMAS`` matches Flipside.
+"""
+import argparse
+import datetime as dt
+import json
+import random
+import sys
+from pathlib import Path
+
+import requests
+
+from dashboard import queries
+from dashboard.decode import mismatches
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S.000'
+
+# Rows and spacing of the synthesized time series.
+SERIES_SHAPES = {
+    'hourly_price': (24 * 365, dt.timedelta(hours=1)),
+    'blocks_by_hour': (24 * 30, dt.timedelta(hours=1)),
+    'active_nodes_by_week': (100, dt.timedelta(weeks=1)),
+    'active_nodes_by_month': (24, dt.timedelta(days=30)),
+    'fees': (100, dt.timedelta(weeks=1)),
+    'daily_fees': (100, dt.timedelta(weeks=1)),
+    'stakes_over_time': (100, dt.timedelta(weeks=1)),
+    'validators_over_time': (100, dt.timedelta(weeks=1)),
+}
+DEFAULT_SHAPE = (365, dt.timedelta(days=1))
+LABELS = {
+    'BLOCKCHAIN': ['NEAR', 'ETH', 'SOL'],
+    'ACTION': ['Stake', 'Unstake'],
+    'SWAPPER': [f'swapper{i}.near' for i in range(10)],
+}
+
+
+def fixture_path(query_id):
+    return FIXTURES_DIR / f'{query_id}.json'
+
+
+def record():
+    FIXTURES_DIR.mkdir(exist_ok=True)
+    with requests.Session() as session:
+        for query_id in sorted(set(queries.QUERIES.values())):
+            response = session.get(queries.query_url(query_id), timeout=60)
+            response.raise_for_status()
+            fixture_path(query_id).write_bytes(response.content)
+            print(f'{queries.query_name(query_id)}: {len(response.content)} bytes')
+
+
+def _value(column, kind, rng):
+    if kind == 'int':
+        return rng.randint(0, 1_000_000)
+    if kind in ('float32', 'float64'):
+        return round(rng.uniform(0.5, 100), 4)
+    return f'{column.lower()}-{rng.randint(0, 9)}'
+
+
+def synthesize_rows(name, schema, rng, now):
+    times = [column for column, kind in schema.items() if kind == 'datetime']
+    labels = [column for column, kind in schema.items() if kind == 'category']
+    combos = [{}]
+    for column in labels:
+        combos = [dict(combo, **{column: label}) for combo in combos for label in LABELS.get(column, ['a', 'b'])]
+    count, step = SERIES_SHAPES.get(name, DEFAULT_SHAPE) if times else (1, None)
+    rows = []
+    for combo in combos:
+        for index in range(count):
+            row = dict(combo)
+            for column, kind in schema.items():
+                if kind == 'datetime':
+                    row[column] = (now - step * (count - 1 - index)).strftime(TIME_FORMAT)
+                elif kind != 'category':
+                    row[column] = _value(column, kind, rng)
+            rows.append(row)
+    return rows
+
+
+def synthesize(seed=0):
+    FIXTURES_DIR.mkdir(exist_ok=True)
+    rng = random.Random(seed)
+    now = dt.datetime.now().replace(minute=0, second=0, microsecond=0)
+    for name, schema in queries.SCHEMAS.items():
+        rows = synthesize_rows(name, schema, rng, now)
+        fixture_path(queries.QUERIES[name]).write_text(json.dumps(rows))
+        print(f'{name}: {len(rows)} rows')
+
+
+def check():
+    """Print every fixture column that does not fit its declared type; return how many there are."""
+    failures = 0
+    for name, schema in queries.SCHEMAS.items():
+        path = fixture_path(queries.QUERIES[name])
+        if not path.exists():
+            print(f'{name}: no fixture')
+            continue
+        for column, error in mismatches(path.read_bytes(), schema).items():
+            print(f'{name}.{column} ({schema[column]}): {error}')
+            failures += 1
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['record', 'synthesize', 'check'])
+    parser.add_argument('--seed', type=int, default=0, help='random seed for synthesize')
+    args = parser.parse_args(argv)
+    if args.command == 'record':
+        record()
+    elif args.command == 'check':
+        return 1 if check() else 0
+    else:
+        synthesize(args.seed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
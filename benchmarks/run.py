@@ -0,0 +1,142 @@
+"""Headless benchmark of Home.py against the local Flipside stand-in.
+
+    python -m benchmarks.run --latency 0.2 --jitter 0.1 --scale 4 --repeat 3
+    python -m benchmarks.run --save baseline.json
+    python -m benchmarks.run --baseline baseline.json --tolerance 0.25
+
+Each repeat starts a fresh interpreter with an empty disk cache and drives
+the app through Streamlit's ``AppTest``:
+
+- ``cold_start_s``: first run, nothing cached anywhere
+- ``warm_rerun_s``: the same page again
+- ``tab_switch_s``: opening a tab that has not been rendered yet
+- ``widget_change_s``: picking another price time range
+- ``restart_s``: first run of a second interpreter over the warm disk cache
+- ``peak_rss_mb``: peak resident memory of the first interpreter
+
+The medians are checked against ``thresholds.json`` and, when given, against
+a saved baseline; any metric over its limit makes the run exit non-zero.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.server import StandInServer, load_payloads
+
+ROOT = Path(__file__).resolve().parent.parent
+THRESHOLDS = Path(__file__).resolve().parent / 'thresholds.json'
+SWITCH_TAB = '**Staking**'
+TIME_RANGE = '1 Year'
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def _timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed
+
+
+def session(restart=False):
+    """Drive one interpreter through the app and return its timings."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / 'Home.py'), default_timeout=600)
+    if restart:
+        return {'restart_s': _timed_run(at)}
+    results = {'cold_start_s': _timed_run(at), 'warm_rerun_s': _timed_run(at)}
+    at.session_state['active_tab'] = SWITCH_TAB
+    results['tab_switch_s'] = _timed_run(at)
+    at.selectbox(key='select_timerange').select(TIME_RANGE)
+    results['widget_change_s'] = _timed_run(at)
+    results['peak_rss_mb'] = _peak_rss_mb()
+    return results
+
+
+def _spawn(api_url, cache_dir, restart=False):
+    env = dict(os.environ, FLIPSIDE_API_URL=api_url, NEAR_DASHBOARD_CACHE_DIR=cache_dir)
+    env.pop('NEAR_DASHBOARD_PROFILE_DIR', None)
+    command = [sys.executable, '-m', 'benchmarks.run', '--session'] + (['--restart'] if restart else [])
+    output = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    if output.returncode:
+        raise RuntimeError(f'benchmark session failed:\n{output.stderr}')
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def measure(server, repeat):
+    samples = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix='near-bench-') as cache_dir:
+            results = _spawn(server.api_url, cache_dir)
+            results.update(_spawn(server.api_url, cache_dir, restart=True))
+        samples.append(results)
+    return {metric: statistics.median(sample[metric] for sample in samples) for metric in samples[0] if samples[0][metric] is not None}
+
+
+def regressions(results, thresholds, baseline=None, tolerance=0.25):
+    """Describe every metric above its threshold or its baseline plus tolerance."""
+    failures = []
+    for metric, value in results.items():
+        limit = thresholds.get(metric)
+        if limit is not None and value > limit:
+            failures.append(f'{metric}: {value:.3f} > threshold {limit}')
+        if baseline and metric in baseline and value > baseline[metric] * (1 + tolerance):
+            failures.append(f'{metric}: {value:.3f} > baseline {baseline[metric]:.3f} + {tolerance:.0%}')
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.1, help='uniform ± spread around the latency')
+    parser.add_argument('--scale', type=int, default=1, help='multiply the length of every time series')
+    parser.add_argument('--repeat', type=int, default=3, help='fresh interpreters to take the median over')
+    parser.add_argument('--thresholds', type=Path, default=THRESHOLDS)
+    parser.add_argument('--baseline', type=Path, help='results of an earlier --save to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown over the baseline')
+    parser.add_argument('--save', type=Path, help='write the results here as JSON')
+    parser.add_argument('--session', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--restart', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.session:
+        print(json.dumps(session(args.restart)))
+        return 0
+
+    server = StandInServer(load_payloads(args.scale), latency=args.latency, jitter=args.jitter).start()
+    try:
+        results = measure(server, args.repeat)
+    finally:
+        server.shutdown()
+    for metric, value in results.items():
+        print(f'{metric:>16} {value:10.3f}')
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+
+    thresholds = json.loads(args.thresholds.read_text()) if args.thresholds.exists() else {}
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    failures = regressions(results, thresholds, baseline, args.tolerance)
+    for failure in failures:
+        print(f'REGRESSION {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Local stand-in for the Flipside API, serving the recorded fixtures.
+
+    python -m benchmarks.server --port 8765 --latency 0.2 --jitter 0.1 --scale 4
+
+Point the dashboard at it with
+``FLIPSIDE_API_URL=http://127.0.0.1:8765/api/v2/queries/{}/data/latest``.
+"""
+import argparse
+import datetime as dt
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import TIME_FORMAT, fixture_path
+from dashboard import queries
+
+
+def _parse_time(value):
+    return dt.datetime.fromisoformat(value.replace('Z', ''))
+
+
+def scale_rows(rows, time_column, factor):
+    """Extend a time series ``factor`` times further into the past.
+
+    Each copy is shifted back by the span of the original, so the scaled
+    series keeps its spacing and its most recent rows.
+    """
+    if factor <= 1 or not rows:
+        return rows
+    times = [_parse_time(row[time_column]) for row in rows]
+    span = max(times) - min(times) + (max(times) - min(times)) / max(len(set(times)) - 1, 1)
+    scaled = []
+    for copy in range(factor - 1, -1, -1):
+        shift = span * copy
+        for row, time_ in zip(rows, times):
+            scaled.append(dict(row, **{time_column: (time_ - shift).strftime(TIME_FORMAT)}))
+    return scaled
+
+
+def load_payloads(scale=1):
+    """Encoded response bodies for every registered query, by query id."""
+    payloads = {}
+    for query_id in set(queries.QUERIES.values()):
+        path = fixture_path(query_id)
+        if not path.exists():
+            raise FileNotFoundError(f'missing fixture {path}; run `python -m benchmarks.fixtures record`')
+        keys = queries.series_keys(query_id)
+        if scale > 1 and keys:
+            rows = scale_rows(json.loads(path.read_bytes()), keys[0], scale)
+            payloads[query_id] = json.dumps(rows).encode()
+        else:
+            payloads[query_id] = path.read_bytes()
+    return payloads
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Serves ``payloads`` after ``latency`` ± ``jitter`` seconds per request."""
+
+    daemon_threads = True
+
+    def __init__(self, payloads, host='127.0.0.1', port=0, latency=0.0, jitter=0.0):
+        super().__init__((host, port), _Handler)
+        self.payloads = payloads
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+
+    @property
+    def api_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/api/v2/queries/{{}}/data/latest'
+
+    def delay(self):
+        return max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, name='flipside-stand-in', daemon=True)
+        thread.start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+        body = self.server.payloads.get(parts[3]) if len(parts) == 6 else None
+        self.server.requests += 1
+        time.sleep(self.server.delay())
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='uniform ± spread around the latency')
+    parser.add_argument('--scale', type=int, default=1, help='multiply the length of every time series')
+    args = parser.parse_args(argv)
+    server = StandInServer(load_payloads(args.scale), args.host, args.port, args.latency, args.jitter)
+    print(f'FLIPSIDE_API_URL={server.api_url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    sys.exit(main())
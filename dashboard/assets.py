@@ -0,0 +1,16 @@
+"""Images shipped in ``Images/``, read from disk once per process."""
+import functools
+from pathlib import Path
+
+IMAGES_DIR = Path(__file__).resolve().parent.parent / 'Images'
+
+
+@functools.lru_cache(maxsize=None)
+def image(name):
+    """The encoded bytes of ``Images/<name>``, which ``st.image`` accepts as is."""
+    return (IMAGES_DIR / name).read_bytes()
+
+
+def preload():
+    for path in sorted(IMAGES_DIR.glob('*.png')):
+        image(path.name)
@@ -0,0 +1,61 @@
+"""Warm the process up before Streamlit starts serving.
+
+    python -m dashboard.boot [streamlit run options]
+
+The first visitor after a deploy would otherwise pay for importing the
+charting stack, reading the images and downloading every query. This
+launcher does all of that in the server process first and then starts
+``streamlit run Home.py`` in the same process, so the script reuses the
+loaded modules and the populated result store. Queries that fail to load
+are logged and left to the page, which fetches them again on demand.
+"""
+import logging
+import sys
+import time
+from pathlib import Path
+
+from dashboard import assets, fetch
+
+HOME = Path(__file__).resolve().parent.parent / 'Home.py'
+
+logger = logging.getLogger(__name__)
+
+
+def import_charting():
+    import plotly.express as px
+    import plotly.io as pio
+
+    # Plotly imports its trace and layout validators on first use.
+    pio.to_json(px.line(x=[0, 1], y=[0, 1]), validate=False)
+    import dashboard.figures  # noqa: F401
+
+
+def populate():
+    failed = 0
+    for name, future in fetch.prefetch().items():
+        try:
+            future.result()
+        except Exception:
+            logger.exception('Warm-up load of %s failed', name)
+            failed += 1
+    return failed
+
+
+def warm_up():
+    start = time.perf_counter()
+    import_charting()
+    assets.preload()
+    failed = populate()
+    logger.info('Warm-up finished in %.1fs (%d queries failed)', time.perf_counter() - start, failed)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(levelname)s %(message)s')
+    warm_up()
+    from streamlit.web import cli
+
+    return cli.main(['run', str(HOME), *(sys.argv[1:] if argv is None else argv)], prog_name='streamlit')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
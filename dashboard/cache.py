@@ -0,0 +1,66 @@
+"""On-disk cache of query results in the Arrow IPC file format.
+
+Each result is stored as ``<query_id>.arrow`` and read back through a memory
+map, so a restarted server can paint the dashboard from local disk. The file
+modification time records when the result was fetched.
+"""
+import os
+import threading
+import time
+from pathlib import Path
+
+import pyarrow as pa
+
+CACHE_DIR = Path(os.environ.get('NEAR_DASHBOARD_CACHE_DIR', Path(__file__).resolve().parent.parent / '.cache'))
+# Flipside re-runs the dashboard queries every 3 hours.
+TTL = float(os.environ.get('NEAR_DASHBOARD_CACHE_TTL', 3 * 60 * 60))
+
+
+def read_frame(path):
+    """Read an Arrow IPC file through a memory map, or return ``None`` if it is missing or unreadable."""
+    try:
+        table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+    return table.to_pandas()
+
+
+def write_frame(path, frame):
+    """Atomically write ``frame`` to ``path``; return ``False`` if Arrow cannot represent it."""
+    try:
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f'.{os.getpid()}-{threading.get_ident()}.tmp')
+    with pa.OSFile(str(tmp), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+    return True
+
+
+class DiskCache:
+    def __init__(self, directory=CACHE_DIR, ttl=TTL):
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    def path(self, query_id):
+        return self.directory / f'{query_id}.arrow'
+
+    def load(self, query_id):
+        """Return ``(frame, fetched_at)`` for a cached result, or ``None`` if there is none."""
+        path = self.path(query_id)
+        try:
+            fetched_at = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        frame = read_frame(path)
+        if frame is None:
+            return None
+        return frame, fetched_at
+
+    def save(self, query_id, frame):
+        write_frame(self.path(query_id), frame)
+
+    def is_fresh(self, fetched_at):
+        return time.time() - fetched_at < self.ttl
@@ -0,0 +1,84 @@
+"""Decoding of Flipside JSON payloads into compactly typed frames.
+
+Payloads are parsed with ``orjson`` when it is installed and turned column by
+column into the dtypes declared in ``queries.SCHEMAS``:
+
+- ``'category'`` for low-cardinality labels,
+- ``'datetime'`` for timestamps, parsed once here instead of in every panel,
+- ``'int'`` for counts, downcast to the smallest integer type that fits,
+- ``'float32'``/``'float64'`` for measurements.
+
+Columns without a declared type are left to pandas' inference, and so is a
+column whose values do not fit its declared type: the mismatch is logged and
+costs that column its compact dtype, not the whole query.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:
+    import json
+
+    loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+
+def _convert(values, kind):
+    if kind == 'datetime':
+        return pd.to_datetime(values, format='ISO8601')
+    if kind == 'category':
+        return pd.Categorical(values)
+    if kind == 'int':
+        return pd.to_numeric(np.asarray(values), downcast='integer')
+    if kind in ('float32', 'float64'):
+        return np.asarray(values, dtype=kind)
+    return pd.Series(values)
+
+
+def _typed(name, values, kind):
+    try:
+        return _convert(values, kind)
+    except (TypeError, ValueError, OverflowError) as exc:
+        logger.warning('Column %s does not hold %s values (%s), inferring its type instead', name, kind, exc)
+        return _convert(values, None)
+
+
+def mismatches(payload, schema):
+    """Return ``{column: error}`` for the columns of ``payload`` that do not fit ``schema``."""
+    rows = loads(payload)
+    errors = {}
+    for name, kind in schema.items():
+        if rows and name not in rows[0]:
+            errors[name] = 'missing'
+            continue
+        try:
+            _convert([row.get(name) for row in rows], kind)
+        except (TypeError, ValueError, OverflowError) as exc:
+            errors[name] = str(exc)
+    return errors
+
+
+def decode(payload, schema=None):
+    """Decode a JSON list of records into a frame typed by ``schema`` (``{column: kind}``)."""
+    rows = loads(payload)
+    schema = schema or {}
+    names = list(rows[0]) if rows else list(schema)
+    columns = {name: _typed(name, [row.get(name) for row in rows], schema.get(name)) for name in names}
+    return pd.DataFrame(columns)
+
+
+def apply_schema(frame, schema):
+    """Cast an already decoded frame (e.g. one merged from several sources) to ``schema``."""
+    if not schema:
+        return frame
+    columns = {}
+    for name in frame.columns:
+        kind = schema.get(name)
+        columns[name] = frame[name] if kind is None else _typed(name, frame[name], kind)
+    return pd.DataFrame(columns, index=frame.index)
@@ -0,0 +1,55 @@
+"""Downsampling of long time series for display.
+
+``lttb`` implements Largest-Triangle-Three-Buckets (Steinarsson, 2013): it
+keeps the first and last points and, from each bucket in between, the point
+spanning the largest triangle with its neighbours, which preserves the
+visual shape of a series with a fixed number of points.
+"""
+import numpy as np
+
+from dashboard import profiling
+
+# Most points a high-volume chart sends to the browser.
+POINT_BUDGET = 2000
+
+
+def lttb(x, y, threshold):
+    """Return the indices of the ``threshold`` points of ``(x, y)`` that LTTB keeps."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x).view('i8') if np.asarray(x).dtype.kind == 'M' else np.asarray(x)
+    x = x.astype('f8')
+    y = np.asarray(y, dtype='f8')
+    edges = np.linspace(1, n - 1, threshold - 1).astype('i8')
+    indices = np.empty(threshold, dtype='i8')
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        areas = np.abs(
+            (x[selected] - next_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (next_y - y[selected])
+        )
+        selected = start + int(areas.argmax())
+        indices[bucket + 1] = selected
+    return indices
+
+
+def downsample(frame, x, y, threshold=POINT_BUDGET):
+    """Return the rows of ``frame`` (sorted by ``x``) that LTTB keeps for the ``y`` column."""
+    if len(frame) <= threshold:
+        return frame
+    return frame.iloc[lttb(frame[x].to_numpy(), frame[y].to_numpy(), threshold)]
+
+
+def window(frame, column, start, end):
+    """Return the rows of ``frame`` (sorted by ``column``) with ``start <= column <= end``."""
+    with profiling.panel_timed('transform'):
+        values = frame[column].to_numpy()
+        lo = np.searchsorted(values, np.datetime64(start), side='left')
+        hi = np.searchsorted(values, np.datetime64(end), side='right')
+        return frame.iloc[lo:hi]
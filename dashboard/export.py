@@ -0,0 +1,267 @@
+"""Static snapshot of the dashboard for plain static hosting.
+
+    python -m dashboard.export --output site
+    python -m http.server --directory site    # to preview it
+
+Every section of ``Home.py`` is evaluated headlessly from the disk cache
+(``NEAR_DASHBOARD_OFFLINE`` is set, so Flipside is never called), one section
+per process, with each widget at its default. Each section becomes an HTML
+page. Its figures are written as Plotly JSON named by a hash of their
+content, plus a PNG thumbnail when kaleido is installed; the page shows the
+thumbnail until plotly.js has drawn the figure.
+
+``manifest.json`` records a fingerprint of each section's cached data, of
+the dashboard code and of whether thumbnails were written. Later exports
+regenerate only the sections whose fingerprint changed, and remove the
+figures no page uses any more.
+
+A section is the unit of regeneration because it is the unit Streamlit
+runs: ``Home.py`` executes top to bottom, so rendering any one panel of a
+tab means running the page up to it, and the price panel above the tabs
+runs with every tab.
+"""
+import argparse
+import hashlib
+import html
+import json
+import multiprocessing
+import os
+import re
+import sys
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from dashboard import queries
+from dashboard.cache import DiskCache
+
+ROOT = Path(__file__).resolve().parent.parent
+HOME = ROOT / 'Home.py'
+THUMBNAIL_SIZE = (640, 360)
+PAGES = {'price': 'index.html', **{section: f'{section}.html' for section in queries.TABS.values()}}
+NAV_LABELS = {'price': 'Price', **{section: label.strip('*') for label, section in queries.TABS.items()}}
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>NEAR Mega Dashboard</title>
+<link rel="icon" href="images/near-logo.png">
+<script src="plotly.min.js"></script>
+<style>
+  body {{ font-family: sans-serif; max-width: 1200px; margin: 0 auto; padding: 1rem; }}
+  nav a {{ margin-right: 1rem; }}
+  .row {{ display: flex; gap: 1rem; }}
+  .col {{ flex: 1; min-width: 0; }}
+  .metric .value {{ font-size: 2rem; }}
+  .caption, .help {{ color: #666; font-size: 0.85rem; }}
+  .warning {{ background: #fff4d6; padding: 0.5rem; }}
+  .chart {{ min-height: 450px; }}
+  .chart img {{ width: 100%; }}
+</style>
+</head>
+<body>
+<nav>{nav}</nav>
+{body}
+<script>
+document.querySelectorAll('.chart').forEach(async (element) => {{
+  const figure = await (await fetch(element.dataset.figure)).json();
+  element.replaceChildren();
+  Plotly.newPlot(element, figure.data, figure.layout, {{responsive: true}});
+}});
+</script>
+</body>
+</html>
+"""
+
+
+def _inline(text):
+    text = html.escape(text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    return re.sub(r'\[([^\]]+)\]\(([^)\s]+)\)', r'<a href="\2">\1</a>', text)
+
+
+def _markdown(text):
+    paragraphs = re.split(r'\n\s*\n', textwrap.dedent(text).strip())
+    return ''.join(f'<p>{_inline(" ".join(paragraph.split()))}</p>' for paragraph in paragraphs if paragraph.strip())
+
+
+class _Renderer:
+    """Turns an ``AppTest`` element tree into HTML, writing its figures to ``output``."""
+
+    def __init__(self, output, thumbnails):
+        self.output = output
+        self.thumbnails = thumbnails
+        self.figures = []
+
+    def children(self, node):
+        return ''.join(self.render(child) for child in node.children.values())
+
+    def render(self, node):
+        kind = node.type
+        if kind in ('title', 'header', 'subheader'):
+            level = {'title': 1, 'header': 2, 'subheader': 3}[kind]
+            return f'<h{level}>{_inline(node.value)}</h{level}>'
+        if kind == 'markdown':
+            # Raw HTML, such as the sidebar style, is for the live app only.
+            return '' if node.value.lstrip().startswith('<') else _markdown(node.value)
+        if kind == 'caption':
+            return f'<p class="caption">{_inline(node.value)}</p>'
+        if kind == 'warning':
+            return f'<p class="warning">{_inline(node.value)}</p>'
+        if kind == 'metric':
+            help_ = f'<div class="help">{html.escape(node.help)}</div>' if node.help else ''
+            return (
+                f'<div class="metric"><div class="label">{_inline(node.label)}</div>'
+                f'<div class="value">{html.escape(node.value)}</div>{help_}</div>'
+            )
+        if kind == 'plotly_chart':
+            return self.figure(node.proto.spec)
+        if kind == 'expander':
+            return f'<details><summary>{_inline(node.label)}</summary>{self.children(node)}</details>'
+        if kind == 'flex_container':
+            return f'<div class="row">{self.children(node)}</div>'
+        if kind == 'column':
+            return f'<div class="col">{self.children(node)}</div>'
+        # Widgets and images have no static counterpart.
+        return ''
+
+    def figure(self, spec):
+        name = hashlib.blake2b(spec.encode(), digest_size=16).hexdigest()
+        path = self.output / 'figures' / f'{name}.json'
+        if not path.exists():
+            path.write_text(spec)
+        self.figures.append(name)
+        thumbnail = self.output / 'thumbnails' / f'{name}.png'
+        if self.thumbnails and not thumbnail.exists():
+            self.write_thumbnail(spec, thumbnail)
+        image = f'<img src="thumbnails/{name}.png" alt="">' if thumbnail.exists() else ''
+        return f'<div class="chart" data-figure="figures/{name}.json">{image}</div>'
+
+    def write_thumbnail(self, spec, path):
+        import plotly.io as pio
+
+        try:
+            width, height = THUMBNAIL_SIZE
+            path.write_bytes(pio.to_image(pio.from_json(spec, skip_invalid=True), format='png', width=width, height=height))
+        except Exception as exc:
+            print(f'Not writing thumbnails: {exc}', file=sys.stderr)
+            self.thumbnails = False
+
+
+def render_section(section, output, thumbnails):
+    """Run ``Home.py`` with ``section`` open and return ``(html, figure names)``.
+
+    The price section is what the page shows above the tabs; every other
+    section is the content of its tab.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(HOME), default_timeout=600)
+    label = next((label for label, name in queries.TABS.items() if name == section), None)
+    if label is not None:
+        at.session_state['active_tab'] = label
+    at.run()
+    if at.exception:
+        raise RuntimeError(f'{section}: {at.exception[0].value}')
+    renderer = _Renderer(Path(output), thumbnails)
+    parts = []
+    for node in at.main.children.values():
+        if node.type != 'tab_container':
+            if label is None:
+                parts.append(renderer.render(node))
+        elif label is not None:
+            tab = next(tab for tab in node.children.values() if tab.label == label)
+            parts.append(renderer.children(tab))
+    return ''.join(parts), renderer.figures
+
+
+def code_version():
+    digest = hashlib.blake2b(digest_size=16)
+    for path in [HOME, *sorted((ROOT / 'dashboard').glob('*.py'))]:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def fingerprint(section, disk_cache, version, thumbnails):
+    """Digest of the code, the thumbnail setting and the cache files behind ``section``."""
+    digest = hashlib.blake2b(f'{version}:thumbnails={thumbnails}'.encode(), digest_size=16)
+    for query_id in sorted({queries.QUERIES[name] for name in queries.SECTIONS[section]}):
+        try:
+            stat = disk_cache.path(query_id).stat()
+        except FileNotFoundError:
+            digest.update(f'{query_id}:missing'.encode())
+        else:
+            digest.update(f'{query_id}:{stat.st_mtime_ns}:{stat.st_size}'.encode())
+    return digest.hexdigest()
+
+
+def thumbnails_supported():
+    """Whether plotly can write PNGs here; warns on stderr when it cannot."""
+    try:
+        import plotly.graph_objects as go
+        import plotly.io as pio
+
+        pio.to_image(go.Figure(), format='png', width=8, height=8)
+    except Exception as exc:
+        print(f'Not writing thumbnails: {" ".join(str(exc).split())}', file=sys.stderr)
+        return False
+    return True
+
+
+def _page(section, body):
+    nav = ''.join(f'<a href="{PAGES[name]}">{html.escape(NAV_LABELS[name])}</a>' for name in PAGES)
+    return PAGE.format(nav=nav, body=body)
+
+
+def export(output, workers=None, thumbnails=True, force=False):
+    """Write the snapshot to ``output`` and return the sections regenerated."""
+    os.environ['NEAR_DASHBOARD_OFFLINE'] = '1'
+    from plotly.offline import get_plotlyjs
+
+    output = Path(output)
+    for directory in ('figures', 'thumbnails', 'images'):
+        (output / directory).mkdir(parents=True, exist_ok=True)
+    (output / 'plotly.min.js').write_text(get_plotlyjs())
+    (output / 'images' / 'near-logo.png').write_bytes((ROOT / 'Images' / 'near-logo.png').read_bytes())
+    thumbnails = thumbnails and thumbnails_supported()
+
+    manifest_path = output / 'manifest.json'
+    manifest = {} if force or not manifest_path.exists() else json.loads(manifest_path.read_text())
+    disk_cache, version = DiskCache(), code_version()
+    fingerprints = {section: fingerprint(section, disk_cache, version, thumbnails) for section in PAGES}
+    stale = [
+        section for section in PAGES
+        if manifest.get(section, {}).get('fingerprint') != fingerprints[section] or not (output / PAGES[section]).exists()
+    ]
+    if stale:
+        # Fresh interpreters: the dashboard modules read their settings on import.
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers or len(stale), mp_context=context) as pool:
+            futures = {section: pool.submit(render_section, section, str(output), thumbnails) for section in stale}
+            for section, future in futures.items():
+                body, figures = future.result()
+                (output / PAGES[section]).write_text(_page(section, body))
+                manifest[section] = {'fingerprint': fingerprints[section], 'figures': figures}
+
+    used = {name for entry in manifest.values() for name in entry['figures']}
+    for path in [*(output / 'figures').glob('*.json'), *(output / 'thumbnails').glob('*.png')]:
+        if path.stem not in used:
+            path.unlink()
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    return stale
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', type=Path, default=ROOT / 'site')
+    parser.add_argument('--workers', type=int, help='processes to render with (default: one per stale section)')
+    parser.add_argument('--no-thumbnails', action='store_true', help='skip the PNG thumbnails')
+    parser.add_argument('--force', action='store_true', help='regenerate every section')
+    args = parser.parse_args(argv)
+    stale = export(args.output, args.workers, not args.no_thumbnails, args.force)
+    print(f'Regenerated {", ".join(stale) if stale else "nothing"} in {args.output}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""Parallel download of the registered Flipside queries.
+
+Every query is fetched on a shared thread pool over one keep-alive HTTP
+session, and the JSON is decoded on the worker thread, so the page only
+waits for the slowest query and the Streamlit script thread never parses.
+
+Results are shared process-wide through a single-flight ``ResultStore`` and
+cached on disk below it. Time series are merged into their local history
+before they are cached. A stale entry is served immediately while a refresh
+runs in the background (stale-while-revalidate).
+
+Calls to Flipside time out, share a global concurrency cap and a token
+bucket, and are retried with jittered exponential backoff. Each query has a
+circuit breaker, so a query that keeps failing is not called again until it
+has had time to recover. A failed refresh leaves the last good result in
+place, and ``collect()`` hands the page whatever loaded in time, so one bad
+query costs one panel rather than the whole page.
+
+With ``NEAR_DASHBOARD_OFFLINE`` set, results come from the disk cache only
+and Flipside is never called.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from dashboard import profiling, queries
+from dashboard.cache import DiskCache
+from dashboard.decode import apply_schema, decode
+from dashboard.history import SeriesStore
+from dashboard.memory import RESULT_BUDGET, frame_bytes
+from dashboard.resilience import CircuitBreaker, CircuitOpen, TokenBucket, backoff
+from dashboard.store import ResultStore
+
+MAX_WORKERS = 16
+# Upstream limits: requests in flight, requests per second and burst size.
+MAX_REQUESTS = 6
+RATE_LIMIT = 10
+BURST = 20
+# Connect and read timeouts of one request, in seconds.
+TIMEOUT = (5, 30)
+MAX_ATTEMPTS = 3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Errors without a response worth retrying; a truncated body is one of them.
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+# Longest Retry-After honoured, so one query cannot park a fetch worker.
+MAX_RETRY_AFTER = 30
+# How long the page waits for its queries before rendering without the slow ones.
+PAGE_TIMEOUT = 20
+OFFLINE = bool(os.environ.get('NEAR_DASHBOARD_OFFLINE'))
+
+logger = logging.getLogger(__name__)
+
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS))
+_session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS))
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='flipside')
+# Small pool for speculative loads, so they never crowd out the visible page.
+_background = ThreadPoolExecutor(max_workers=2, thread_name_prefix='flipside-warm')
+
+disk_cache = DiskCache()
+history = SeriesStore()
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+# query_id -> Future of the download in flight, so each query has at most one.
+_downloads = {}
+_downloads_lock = threading.Lock()
+_requests = threading.BoundedSemaphore(MAX_REQUESTS)
+_rate_limit = TokenBucket(RATE_LIMIT, BURST)
+_breakers = {}
+
+
+def breaker(query_id):
+    return _breakers.setdefault(query_id, CircuitBreaker())
+
+
+def _retry_delay(response, attempt):
+    retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+    return min(float(retry_after), MAX_RETRY_AFTER) if retry_after.isdigit() else backoff(attempt)
+
+
+def _get(query_id):
+    """Download the raw result of ``query_id`` through its circuit breaker."""
+    name = queries.query_name(query_id)
+    circuit = breaker(query_id)
+    if not circuit.allow():
+        raise CircuitOpen(name)
+    # Every way out must resolve the call, or a half-open circuit keeps its trial forever.
+    try:
+        payload = _get_with_retries(query_id, name)
+    except BaseException:
+        circuit.failure()
+        raise
+    circuit.success()
+    return payload
+
+
+def _get_with_retries(query_id, name):
+    for attempt in range(MAX_ATTEMPTS):
+        response = None
+        try:
+            _rate_limit.acquire()
+            with _requests:
+                response = _session.get(queries.query_url(query_id), timeout=TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            if response is None:
+                retryable = isinstance(exc, RETRY_ERRORS)
+            else:
+                retryable = response.status_code in RETRY_STATUSES
+            if not retryable or attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = _retry_delay(response, attempt)
+            logger.warning('Query %s failed (%s), retrying in %.1fs', name, exc, delay)
+            profiling.record('query', name, 'retry', delay)
+            time.sleep(delay)
+        else:
+            return response.content
+
+
+def fetch(query_id):
+    name = queries.query_name(query_id)
+    start = time.perf_counter()
+    payload = _get(query_id)
+    profiling.record('query', name, 'network', time.perf_counter() - start, nbytes=len(payload))
+    with profiling.timed('query', name, 'decode'):
+        return decode(payload, queries.schema(query_id))
+
+
+def _download(query_id):
+    frame = fetch(query_id)
+    keys = queries.series_keys(query_id)
+    if keys is not None:
+        frame = apply_schema(history.append(query_id, frame, keys), queries.schema(query_id))
+    disk_cache.save(query_id, frame)
+    return frame, time.time()
+
+
+def _saved_at(query_id):
+    try:
+        return disk_cache.path(query_id).stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def download(query_id, since=None):
+    """Download ``query_id`` and return ``(frame, fetched_at)``.
+
+    Single-flight: a caller that finds a download of the same query in
+    flight waits for its result instead of starting another. With ``since``,
+    a result some other download saved after that time is read back from
+    disk rather than downloaded again.
+    """
+    if OFFLINE:
+        raise Unavailable(queries.query_name(query_id))
+    with _downloads_lock:
+        future = _downloads.get(query_id)
+        leader = future is None
+        if leader:
+            # Checked under the lock: a download saves before it leaves _downloads.
+            saved_at = None if since is None else _saved_at(query_id)
+            if saved_at is not None and saved_at > since:
+                leader = False
+            else:
+                future = _downloads[query_id] = Future()
+    if future is None:
+        cached = disk_cache.load(query_id)
+        return download(query_id) if cached is None else cached
+    if leader:
+        try:
+            future.set_result(_download(query_id))
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with _downloads_lock:
+                del _downloads[query_id]
+    return future.result()
+
+
+def _load_uncached(query_id):
+    start = time.perf_counter()
+    cached = disk_cache.load(query_id)
+    profiling.record(
+        'query', queries.query_name(query_id), 'disk', time.perf_counter() - start,
+        cache='miss' if cached is None else 'hit',
+    )
+    if cached is None:
+        return download(query_id)
+    return cached
+
+
+def _spill(query_id, frame):
+    # download() writes every result to disk before it reaches the store, so
+    # this only writes when that failed or the file has since been removed.
+    if not disk_cache.path(query_id).exists():
+        disk_cache.save(query_id, frame)
+
+
+store = ResultStore(_load_uncached, RESULT_BUDGET, _spill)
+
+
+def _refresh(query_id, fetched_at):
+    try:
+        store.put(query_id, *download(query_id, since=fetched_at))
+    except CircuitOpen:
+        logger.info('Skipped refresh of query %s while its circuit is open', query_id)
+    except Exception:
+        logger.exception('Background refresh of query %s failed', query_id)
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(query_id)
+
+
+def refresh_in_background(query_id, fetched_at):
+    with _refreshing_lock:
+        if query_id in _refreshing:
+            return
+        _refreshing.add(query_id)
+    _executor.submit(_refresh, query_id, fetched_at)
+
+
+def load(query_id):
+    """Return the shared ``(frame, fetched_at)`` of ``query_id``, loading it from disk or the network on a miss."""
+    start, started_at = time.perf_counter(), time.time()
+    hit = query_id in store
+    frame, fetched_at = store.get(query_id)
+    if hit:
+        tier = 'memory'
+    else:
+        # A result fetched after this load began was downloaded for it.
+        tier = 'network' if fetched_at >= started_at else 'disk'
+    profiling.record('query', queries.query_name(query_id), 'load', time.perf_counter() - start, cache=tier)
+    if not OFFLINE and not disk_cache.is_fresh(fetched_at):
+        refresh_in_background(query_id, fetched_at)
+    return frame, fetched_at
+
+
+def derived(name, frame, key, build, nbytes=frame_bytes):
+    """Return ``build(frame)`` for the result of ``name``, cached with that result in the store."""
+    return store.derived(queries.QUERIES[name], key, frame, build, nbytes)
+
+
+def prefetch(names=None):
+    """Start loading ``names`` (default: every registered query) and return their futures."""
+    if names is None:
+        names = queries.QUERIES
+    futures = {}
+    for name in names:
+        query_id = queries.QUERIES[name]
+        if query_id not in futures:
+            futures[query_id] = _executor.submit(load, query_id)
+    return {name: futures[queries.QUERIES[name]] for name in names}
+
+
+def warm(names):
+    """Load ``names`` on the low-priority pool without waiting for them."""
+    for query_id in {queries.QUERIES[name] for name in names}:
+        if query_id not in store:
+            _background.submit(load, query_id)
+
+
+class Unavailable(Exception):
+    """A query the page needs could not be loaded."""
+
+
+class Results(dict):
+    """Frames by query name; looking up a query that did not load raises ``Unavailable``."""
+
+    def __init__(self, frames, failures, fetched_at):
+        super().__init__(frames)
+        self.failures = failures
+        self.fetched_at = fetched_at
+
+    def __missing__(self, name):
+        if name in self.failures:
+            raise Unavailable(name) from self.failures[name]
+        raise KeyError(name)
+
+    def as_of(self, name):
+        """Describe when the frame behind ``name`` was fetched, for a metric's help text."""
+        if name not in self.fetched_at:
+            return None
+        return time.strftime('Data as of %Y-%m-%d %H:%M UTC', time.gmtime(self.fetched_at[name]))
+
+
+def collect(pending, timeout=PAGE_TIMEOUT):
+    """Wait up to ``timeout`` seconds for ``pending`` and return the ``Results``.
+
+    Queries still loading after that keep loading in the background, so they
+    are in memory for a later rerun. The frames are read from one snapshot of
+    the store, so every panel of the run shows the same round of results.
+    """
+    wait(set(pending.values()), timeout)
+    snapshot = store.snapshot()
+    frames, failures, fetched_at = {}, {}, {}
+    for name, future in pending.items():
+        if not future.done():
+            failures[name] = TimeoutError(f'still loading after {timeout}s')
+        elif future.exception() is not None:
+            failures[name] = future.exception()
+        else:
+            # An entry evicted since it loaded is still in the future's result.
+            frames[name], fetched_at[name] = snapshot.get(queries.QUERIES[name], future.result())
+    return Results(frames, failures, fetched_at)
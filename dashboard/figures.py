@@ -0,0 +1,147 @@
+"""Memoized Plotly figures.
+
+Building a figure with ``plotly.express`` dominates the cost of a rerun, so
+``chart()`` keeps every figure it builds keyed by the chart spec (the
+express function and its arguments) and a fingerprint of the plotted data.
+Reruns and other sessions showing the same data get the cached figure back,
+and a refreshed snapshot changes the fingerprint, so its figures are rebuilt
+on first use. The serialized JSON of each figure is kept alongside it.
+
+The cache keeps to a byte budget (see ``dashboard.memory``). Evicted figures
+are spilled to disk as JSON and reloaded from there on their next use, which
+is several times cheaper than building them again.
+
+Charts of long series pass ``max_points``: the data is downsampled with LTTB
+to that many points and drawn with WebGL traces. Bars have no WebGL trace
+type, so a long bar series is drawn as a line.
+"""
+import hashlib
+import os
+import threading
+import time
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from dashboard import profiling
+from dashboard.cache import CACHE_DIR
+from dashboard.downsample import downsample
+from dashboard.memory import FIGURE_BUDGET, victims
+
+SPILL_DIR = CACHE_DIR / 'figures'
+# Spilled figures kept on disk; the oldest go first past this.
+MAX_SPILLED = 1024
+# A figure object holds its own template and layout objects, about this much
+# on top of its data arrays.
+FIGURE_OVERHEAD = 128 << 10
+
+
+class CachedFigure:
+    def __init__(self, figure, json=None):
+        self.figure = figure
+        self.json = pio.to_json(figure, validate=False) if json is None else json
+        arrays = sum(getattr(value, 'nbytes', 0) for trace in figure.data for value in trace.to_plotly_json().values())
+        self.nbytes = len(self.json) + arrays + FIGURE_OVERHEAD
+
+
+_figures = {}
+_last_used = {}
+_lock = threading.Lock()
+
+
+def fingerprint(frame):
+    """Return a digest of the column names and content of ``frame``."""
+    digest = hashlib.blake2b(repr(list(frame.columns)).encode(), digest_size=16)
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _build(kind, frame, layout, traces, kwargs):
+    figure = getattr(px, kind)(frame, **kwargs)
+    for trace in traces:
+        trace = dict(trace)
+        trace_type = trace.pop('type')
+        figure.add_trace(getattr(go, trace_type)(x=frame[trace.pop('x')], y=frame[trace.pop('y')], **trace))
+    figure.update_layout(**layout)
+    return figure
+
+
+def _spill_path(key):
+    return SPILL_DIR / f'{hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()}.json'
+
+
+def _spill(key, entry):
+    path = _spill_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f'.{os.getpid()}-{threading.get_ident()}.tmp')
+    tmp.write_text(entry.json)
+    os.replace(tmp, path)
+    spilled = sorted(SPILL_DIR.glob('*.json'), key=lambda spilled: spilled.stat().st_mtime)
+    for stale in spilled[:-MAX_SPILLED]:
+        stale.unlink(missing_ok=True)
+
+
+def _unspill(key):
+    try:
+        text = _spill_path(key).read_text()
+        return CachedFigure(pio.from_json(text, skip_invalid=True), text)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _insert(key, entry):
+    with _lock:
+        _figures[key] = entry
+        _last_used[key] = time.monotonic()
+        sizes = {cached_key: cached.nbytes for cached_key, cached in _figures.items()}
+        evicted = {}
+        for victim in victims(sizes, _last_used, FIGURE_BUDGET, keep={key}):
+            evicted[victim] = _figures.pop(victim)
+            del _last_used[victim]
+        used, entries = sum(cached.nbytes for cached in _figures.values()), len(_figures)
+    for cached_key, cached in evicted.items():
+        _spill(cached_key, cached)
+        profiling.record('memory', 'figures', 'evict', nbytes=cached.nbytes)
+    profiling.set_memory('figures', used, FIGURE_BUDGET, entries)
+
+
+def cached(kind, frame, layout=None, traces=(), max_points=None, **kwargs):
+    """Return the ``CachedFigure`` of ``px.<kind>(frame, **kwargs)`` with ``layout`` applied.
+
+    ``traces`` are extra ``plotly.graph_objects`` traces to add, given as dicts
+    with a ``type`` (e.g. ``'Bar'``) and the ``x``/``y`` column names.
+    ``max_points`` turns on the high-volume mode described above.
+    """
+    layout = layout or {}
+    spec = (kind, sorted(kwargs.items()), sorted(layout.items()), list(traces), max_points)
+    start = time.perf_counter()
+    key = (repr(spec), fingerprint(frame))
+    with _lock:
+        entry = _figures.get(key)
+        if entry is not None:
+            _last_used[key] = time.monotonic()
+    if entry is not None:
+        profiling.record('panel', profiling.current_panel(), 'figure', time.perf_counter() - start, cache='hit')
+        return entry
+    entry = _unspill(key)
+    if entry is not None:
+        profiling.record('panel', profiling.current_panel(), 'figure', time.perf_counter() - start, cache='spill')
+        _insert(key, entry)
+        return entry
+    if max_points is not None:
+        if len(frame) > max_points:
+            frame = downsample(frame, kwargs['x'], kwargs['y'], max_points)
+            kind = 'line'
+        if kind in ('line', 'scatter'):
+            kwargs['render_mode'] = 'webgl'
+    entry = CachedFigure(_build(kind, frame, layout, traces, kwargs))
+    profiling.record('panel', profiling.current_panel(), 'figure', time.perf_counter() - start, cache='miss')
+    _insert(key, entry)
+    return entry
+
+
+def chart(kind, frame, layout=None, traces=(), max_points=None, **kwargs):
+    """Return the cached ``plotly.express`` figure described by the arguments (see ``cached``)."""
+    return cached(kind, frame, layout, traces, max_points, **kwargs).figure
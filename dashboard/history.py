@@ -0,0 +1,86 @@
+"""Append-only local history of the time-series queries.
+
+Flipside always returns a query's full result, but only its newest rows
+change between refreshes. Each series is stored under
+``<cache dir>/series/<query_id>/`` as numbered Arrow IPC segments. A refresh
+diffs the download against the stored rows and appends a segment holding
+only the new or changed ones, and reading concatenates the segments, keeping
+the latest version of each row. Rows that drop out of the upstream query's
+window are kept, so the local history can reach further back than Flipside
+returns.
+"""
+import logging
+import threading
+
+import pandas as pd
+
+from dashboard.cache import CACHE_DIR, read_frame, write_frame
+
+# Segments are merged into one once a series has more than this many.
+MAX_SEGMENTS = 32
+
+logger = logging.getLogger(__name__)
+
+
+class SeriesStore:
+    def __init__(self, directory=CACHE_DIR / 'series'):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _segments(self, query_id):
+        return sorted((self.directory / query_id).glob('*.arrow'))
+
+    def _read(self, query_id, keys):
+        segments = [frame for frame in map(read_frame, self._segments(query_id)) if frame is not None]
+        if not segments:
+            return None
+        frame = pd.concat(segments, ignore_index=True)
+        frame = frame.drop_duplicates(subset=keys, keep='last')
+        return frame.sort_values(keys[0], kind='stable', ignore_index=True)
+
+    def _write_segment(self, query_id, frame):
+        """Write ``frame`` as the next segment and return the ones before it, or ``None`` if it cannot be stored."""
+        segments = self._segments(query_id)
+        index = int(segments[-1].stem) + 1 if segments else 0
+        if not write_frame(self.directory / query_id / f'{index:06d}.arrow', frame):
+            return None
+        return segments
+
+    def read(self, query_id, keys):
+        """Return the stored rows of ``query_id`` as one frame sorted by ``keys[0]``, or ``None``."""
+        with self._lock:
+            return self._read(query_id, keys)
+
+    def append(self, query_id, frame, keys):
+        """Store the rows of ``frame`` that are new or changed and return the full history.
+
+        ``keys`` identify a row; the first is the time column.
+        """
+        if not set(keys) <= set(frame.columns):
+            logger.warning('Query %s has no %s columns, not keeping its history', query_id, keys)
+            return frame
+        with self._lock:
+            stored = self._read(query_id, keys)
+            if stored is None or list(stored.columns) != list(frame.columns):
+                # First download, or the query's columns changed: start the history over.
+                old_segments = self._write_segment(query_id, frame)
+                if old_segments is None:
+                    return frame
+                for segment in old_segments:
+                    segment.unlink()
+                return self._read(query_id, keys)
+            try:
+                matches = frame.merge(stored.drop_duplicates(), how='left', on=list(frame.columns), indicator=True)
+                changed = frame[(matches['_merge'] == 'left_only').to_numpy()]
+            except (TypeError, ValueError):
+                changed = frame
+            if changed.empty:
+                return stored
+            old_segments = self._write_segment(query_id, changed)
+            if old_segments is None:
+                return frame
+            history = self._read(query_id, keys)
+            if len(old_segments) >= MAX_SEGMENTS:
+                for segment in self._write_segment(query_id, history) or []:
+                    segment.unlink()
+            return history
@@ -0,0 +1,45 @@
+"""Byte accounting and eviction for the in-memory caches.
+
+The result store and the figure cache each keep to a byte budget. When an
+insertion takes a cache over its budget, entries are evicted by
+size-weighted LRU: the entry with the largest ``bytes × seconds since last
+use`` goes first, so one big idle frame is evicted before many small recent
+ones. Evicted entries are spilled to the disk tier, from where a later miss
+reloads them.
+"""
+import os
+import time
+
+MB = 1 << 20
+RESULT_BUDGET = int(float(os.environ.get('NEAR_DASHBOARD_RESULT_BUDGET_MB', 512)) * MB)
+FIGURE_BUDGET = int(float(os.environ.get('NEAR_DASHBOARD_FIGURE_BUDGET_MB', 128)) * MB)
+
+
+def frame_bytes(frame):
+    """The memory held by ``frame``, its index and the objects in its columns."""
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+def victims(sizes, last_used, budget, keep=()):
+    """Keys to evict, in order, so the rest of ``sizes`` fits in ``budget``.
+
+    ``last_used`` maps keys to ``time.monotonic()`` of their last use. Keys in
+    ``keep`` are never chosen, so an entry larger than the whole budget stays
+    until something newer replaces it.
+    """
+    used = sum(sizes.values())
+    if used <= budget:
+        return []
+    now = time.monotonic()
+    candidates = sorted(
+        (key for key in sizes if key not in keep),
+        key=lambda key: (sizes[key] * (now - last_used[key]), sizes[key]),
+        reverse=True,
+    )
+    evicted = []
+    for key in candidates:
+        if used <= budget:
+            break
+        evicted.append(key)
+        used -= sizes[key]
+    return evicted
@@ -0,0 +1,85 @@
+"""Time-indexed NEAR price series behind the Price Chart.
+
+The hourly prices are sorted once and kept as numpy arrays, so a time range
+is sliced with a binary search instead of a boolean mask over the whole
+history. Coarser levels of detail are precomputed by keeping the minimum
+and maximum of every group of points, which halves the series per level
+while preserving its peaks and troughs. Long ranges are served from the
+finest level that fits in ``MAX_POINTS``, so the chart payload stays
+bounded as history grows. The series is cached with its query result in the
+result store, so its levels count towards the store's byte budget.
+"""
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from dashboard import fetch, profiling
+
+RANGES = {
+    "All Time": None,
+    "24 Hours": pd.Timedelta(hours=24),
+    "7 Days": pd.Timedelta(days=7),
+    "30 Days": pd.Timedelta(days=30),
+    "90 Days": pd.Timedelta(days=90),
+    "1 Year": pd.Timedelta(days=365),
+}
+MAX_POINTS = 2000
+
+
+def _minmax_halve(hours, prices):
+    """Keep the lowest and highest point (in time order) of every 4 points."""
+    n = len(hours) // 4 * 4
+    bucket_hours = hours[:n].reshape(-1, 4)
+    bucket_prices = prices[:n].reshape(-1, 4)
+    low = bucket_prices.argmin(axis=1)
+    high = bucket_prices.argmax(axis=1)
+    keep = np.stack([np.minimum(low, high), np.maximum(low, high)], axis=1)
+    return (
+        np.concatenate([np.take_along_axis(bucket_hours, keep, axis=1).ravel(), hours[n:]]),
+        np.concatenate([np.take_along_axis(bucket_prices, keep, axis=1).ravel(), prices[n:]]),
+    )
+
+
+class PriceSeries:
+    def __init__(self, hourly_price, blockchain='NEAR'):
+        rows = hourly_price[hourly_price['BLOCKCHAIN'] == blockchain]
+        hours = pd.to_datetime(rows['HOUR']).to_numpy()
+        order = np.argsort(hours, kind='stable')
+        self.levels = [(hours[order], rows['HOURLY_PRICE'].to_numpy()[order])]
+        while len(self.levels[-1][0]) > MAX_POINTS:
+            self.levels.append(_minmax_halve(*self.levels[-1]))
+
+    def window(self, time_range, now=None):
+        """Return the ``HOUR``/``HOURLY_PRICE`` points of ``time_range``, downsampled to at most ``MAX_POINTS``."""
+        with profiling.panel_timed('transform'):
+            return self._window(time_range, now)
+
+    def _window(self, time_range, now):
+        delta = RANGES[time_range]
+        start = 0
+        if delta is not None:
+            since = np.datetime64((now or dt.datetime.now()) - delta)
+            start = np.searchsorted(self.levels[0][0], since)
+        points = len(self.levels[0][0]) - start
+        level = 0
+        if points > MAX_POINTS:
+            level = min(int(np.ceil(np.log2(points / MAX_POINTS))), len(self.levels) - 1)
+        hours, prices = self.levels[level]
+        if delta is not None:
+            start = np.searchsorted(hours, since)
+        return pd.DataFrame({'HOUR': hours[start:], 'HOURLY_PRICE': prices[start:]})
+
+
+def _series_bytes(series):
+    return sum(hours.nbytes + prices.nbytes for hours, prices in series.levels)
+
+
+def _build(hourly_price):
+    with profiling.panel_timed('transform'):
+        return PriceSeries(hourly_price)
+
+
+def near_price_series(name, hourly_price):
+    """Return the ``PriceSeries`` of ``hourly_price``, the result of query ``name``, building it once per result."""
+    return fetch.derived(name, hourly_price, 'near_price_series', _build, _series_bytes)
@@ -0,0 +1,201 @@
+"""Per-query and per-panel performance instrumentation.
+
+Every measurement is an event with a ``kind`` (``'query'`` or ``'panel'``),
+the query or panel ``name``, a ``phase`` and, where it applies, a duration,
+a payload size in bytes and the cache tier or hit/miss that served it:
+
+- queries record ``network`` and ``decode`` time, payload bytes, which tier
+  (``memory``, ``disk`` or ``network``) served each ``load``, and whether
+  the ``disk`` lookup behind a memory miss found a cached file (hit/miss);
+- panels record ``transform`` (rollups, price windows, zoom slices),
+  ``figure`` (figure build, with figure-cache hit, spill or miss), ``render``
+  (Streamlit serialization) and ``total`` time;
+- the in-memory caches record each ``evict`` (kind ``'memory'``) with the
+  bytes it freed, and report their current size with ``set_memory()``.
+
+Panel phases are attributed to the panel opened with ``start_panel()`` on
+the current script thread. Events are aggregated in memory, kept in a ring
+buffer, and appended as JSON lines to ``$NEAR_DASHBOARD_PROFILE_DIR/profile.jsonl``
+when that variable is set. ``prometheus()`` renders the aggregates in the
+Prometheus text format.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+PROFILE_DIR = os.environ.get('NEAR_DASHBOARD_PROFILE_DIR')
+RECENT_EVENTS = 1000
+
+_current_panel = contextvars.ContextVar('panel', default=None)
+_lock = threading.Lock()
+_events = deque(maxlen=RECENT_EVENTS)
+_phases = defaultdict(lambda: {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'bytes': 0})
+_caches = defaultdict(int)
+_memory = {}
+
+
+def record(kind, name, phase, seconds=None, nbytes=None, cache=None):
+    event = {'ts': time.time(), 'kind': kind, 'name': name, 'phase': phase}
+    if seconds is not None:
+        event['seconds'] = seconds
+    if nbytes is not None:
+        event['bytes'] = nbytes
+    if cache is not None:
+        event['cache'] = cache
+    with _lock:
+        _events.append(event)
+        if seconds is not None or nbytes is not None:
+            stats = _phases[kind, name, phase]
+            stats['count'] += 1
+            stats['seconds'] += seconds or 0.0
+            stats['max_seconds'] = max(stats['max_seconds'], seconds or 0.0)
+            stats['bytes'] += nbytes or 0
+        if cache is not None:
+            _caches[kind, name, phase, cache] += 1
+        if PROFILE_DIR:
+            path = Path(PROFILE_DIR) / 'profile.jsonl'
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open('a') as log:
+                log.write(json.dumps(event) + '\n')
+
+
+@contextmanager
+def timed(kind, name, phase):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(kind, name, phase, time.perf_counter() - start)
+
+
+def current_panel():
+    current = _current_panel.get()
+    return 'unattributed' if current is None else current[0]
+
+
+def panel_timed(phase):
+    """Time ``phase`` of the panel open on this thread."""
+    return timed('panel', current_panel(), phase)
+
+
+def start_panel(name):
+    """Close the panel open on this thread, if any, and attribute what follows to ``name``."""
+    end_panel()
+    _current_panel.set((name, time.perf_counter()))
+
+
+def end_panel():
+    current = _current_panel.get()
+    if current is not None:
+        name, start = current
+        _current_panel.set(None)
+        record('panel', name, 'total', time.perf_counter() - start)
+
+
+def set_memory(cache, nbytes, budget, entries):
+    """Report the bytes and entries ``cache`` holds now, against its ``budget``."""
+    with _lock:
+        _memory[cache] = {'bytes': nbytes, 'budget': budget, 'entries': entries}
+
+
+def memory():
+    """Return the size, budget and eviction count of each in-memory cache as a frame."""
+    with _lock:
+        rows = [
+            {'cache': cache, **values, 'evictions': _phases.get(('memory', cache, 'evict'), {}).get('count', 0)}
+            for cache, values in sorted(_memory.items())
+        ]
+    frame = pd.DataFrame(rows, columns=['cache', 'bytes', 'budget', 'entries', 'evictions'])
+    frame['used'] = frame['bytes'] / frame['budget']
+    return frame
+
+
+def stats():
+    """Return the aggregated timings, payload sizes and cache counts as a frame."""
+    with _lock:
+        rows = [
+            {'kind': kind, 'name': name, 'phase': phase, **values}
+            for (kind, name, phase), values in _phases.items()
+        ]
+        caches = dict(_caches)
+    frame = pd.DataFrame(rows, columns=['kind', 'name', 'phase', 'count', 'seconds', 'max_seconds', 'bytes'])
+    frame['mean_ms'] = frame['seconds'] / frame['count'].where(frame['count'] > 0) * 1000
+    for result in sorted({cache for *_, cache in caches}):
+        frame[result] = [
+            caches.get((kind, name, phase, result), 0)
+            for kind, name, phase in zip(frame['kind'], frame['name'], frame['phase'])
+        ]
+    return frame.sort_values('seconds', ascending=False, ignore_index=True)
+
+
+def recent_events():
+    with _lock:
+        return ''.join(json.dumps(event) + '\n' for event in _events)
+
+
+def _labels(**labels):
+    return ','.join(f'{key}="{str(value).replace(chr(34), chr(39))}"' for key, value in labels.items())
+
+
+def prometheus():
+    with _lock:
+        phases = dict(_phases)
+        caches = dict(_caches)
+        memory = dict(_memory)
+    lines = [
+        '# HELP near_dashboard_phase_seconds Time spent per query or panel phase.',
+        '# TYPE near_dashboard_phase_seconds summary',
+    ]
+    for (kind, name, phase), values in sorted(phases.items()):
+        if kind == 'memory':
+            continue
+        labels = _labels(kind=kind, name=name, phase=phase)
+        lines.append(f'near_dashboard_phase_seconds_sum{{{labels}}} {values["seconds"]:.6f}')
+        lines.append(f'near_dashboard_phase_seconds_count{{{labels}}} {values["count"]}')
+    lines += [
+        '# HELP near_dashboard_payload_bytes_total Bytes downloaded per query.',
+        '# TYPE near_dashboard_payload_bytes_total counter',
+    ]
+    for (kind, name, phase), values in sorted(phases.items()):
+        if values['bytes'] and phase == 'network':
+            lines.append(f'near_dashboard_payload_bytes_total{{{_labels(kind=kind, name=name)}}} {values["bytes"]}')
+    lines += [
+        '# HELP near_dashboard_cache_total Loads per cache tier or result.',
+        '# TYPE near_dashboard_cache_total counter',
+    ]
+    for (kind, name, phase, result), count in sorted(caches.items()):
+        lines.append(f'near_dashboard_cache_total{{{_labels(kind=kind, name=name, phase=phase, result=result)}}} {count}')
+    for metric, field, help_ in [
+        ('memory_bytes', 'bytes', 'Bytes held by each in-memory cache.'),
+        ('memory_budget_bytes', 'budget', 'Byte budget of each in-memory cache.'),
+        ('memory_entries', 'entries', 'Entries held by each in-memory cache.'),
+    ]:
+        lines += [f'# HELP near_dashboard_{metric} {help_}', f'# TYPE near_dashboard_{metric} gauge']
+        for cache, values in sorted(memory.items()):
+            lines.append(f'near_dashboard_{metric}{{{_labels(cache=cache)}}} {values[field]}')
+    lines += [
+        '# HELP near_dashboard_memory_evictions_total Entries evicted from each in-memory cache.',
+        '# TYPE near_dashboard_memory_evictions_total counter',
+    ]
+    for (kind, name, phase), values in sorted(phases.items()):
+        if kind == 'memory' and phase == 'evict':
+            lines.append(f'near_dashboard_memory_evictions_total{{{_labels(cache=name)}}} {values["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def dump():
+    """Write the Prometheus text to ``$NEAR_DASHBOARD_PROFILE_DIR/metrics.prom``, if that is set."""
+    if not PROFILE_DIR:
+        return
+    path = Path(PROFILE_DIR) / 'metrics.prom'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f'.{os.getpid()}-{threading.get_ident()}.tmp')
+    tmp.write_text(prometheus())
+    os.replace(tmp, path)
@@ -0,0 +1,153 @@
+"""Registry of the Flipside queries behind each dashboard panel."""
+import os
+
+# ``FLIPSIDE_API_URL`` points the dashboard at another server, such as the
+# benchmark stand-in in ``benchmarks/server.py``.
+API_URL = os.environ.get('FLIPSIDE_API_URL', 'https://node-api.flipsidecrypto.com/api/v2/queries/{}/data/latest')
+
+QUERIES = {
+    # Price Chart
+    'current_price': '6b0abb21-08e5-4aff-860b-7881ab5213ee',
+    'hourly_price': 'a0ffdf60-8fb8-4305-bd7e-985c9cfbfd08',
+    # Metrics
+    'total_active_nodes': '43656c5e-7d7b-4986-b03f-fd114ca4b1d5',
+    'active_nodes_by_day': '9cb68077-5821-4e26-8d4b-aa57421d4a1f',
+    'active_nodes_by_week': '0a88df20-d8e6-41d3-b5db-7afb983d2716',
+    'active_nodes_by_month': 'e1c1835b-9033-4455-b787-aeaa0ff9cf84',
+    'new_nodes': '3b4a99c8-8bc0-476d-82ed-a78a60242e15',
+    'total_blocks': '29b93124-ae51-42b7-8db9-5829e8792a95',
+    'blocks_by_hour': '67cdef00-309f-4383-bcfd-485cb5c47f0b',
+    'blocks_by_day': '5b87550e-ae9c-4950-9c27-c8bc884f7cdc',
+    'total_trans': 'decb895c-c1b5-45b2-b8f1-4c3911e0175b',
+    'total_tps': 'decb895c-c1b5-45b2-b8f1-4c3911e0175b',
+    'trans_per_day': '876aa346-8b81-4f88-8d79-c0329e30db9f',
+    'tps_per_day': '876aa346-8b81-4f88-8d79-c0329e30db9f',
+    'avg_latency': 'e2a0f2fb-03fb-462d-9d3c-f1cdfd993bf4',
+    'latency_per_day': '1e22c399-612f-4d8b-8134-c029eaa846a8',
+    # Swaps
+    'total_swaps': 'e27380a3-b603-4eef-ab5f-1bb0a3ed2255',
+    'swap_activity': '6b8977d0-da7e-404c-bc80-07b45b6e223b',
+    'top_traders_1': 'e13bdb4f-4590-4420-a3d3-2e120326c292',
+    'top_traders_2': '1e8af9f9-5fd0-4411-85b8-104f10cbd82a',
+    'near_swaps': '4c5dbb8e-3d3a-4ecf-a245-c7e36b92f4ea',
+    'near_swaps_volume': 'b0d1bded-7b96-4c72-b68f-5142044a38cf',
+    'near_swappers': 'fc89e9b0-26d3-491e-b3d8-2351138e9b87',
+    'top_near_swappers_1': 'e0fefd99-8536-433f-9c83-fad067a3e2f5',
+    'top_near_swappers_2': '1cc3e8ed-b59c-465d-8669-635e6fb53338',
+    # GAS & Fees
+    'near_fees': 'de67356b-c2fa-4d8f-b594-11076d303964',
+    'fees': '2100bcb8-3a86-425f-a189-8491ba61b513',
+    'avg_fee_per_tx': 'b3e9b66b-84ce-4b01-ac8e-7de2d34cf48f',
+    'daily_fees': 'b99f37d4-9fd6-4205-99cd-a13f93602e58',
+    # Staking
+    'total_pools': '3ea466a6-6f61-4893-8a09-38bec66030ef',
+    'validators': '80ce068a-dcc9-42e3-bd84-fee610dbba09',
+    'pools': '80ce068a-dcc9-42e3-bd84-fee610dbba09',
+    'stakes': '7e8e8862-c09d-441b-b135-42a985b284b9',
+    'stakes_over_time': '44b84544-01f0-4489-8c34-18578a28f838',
+    'validators_over_time': 'ff352b3d-ec72-4735-a563-7182990901a6',
+}
+
+# Queries needed by each section of the page, so a tab only loads its own data.
+SECTIONS = {
+    'price': ['current_price', 'hourly_price'],
+    'metrics': [
+        'total_active_nodes', 'active_nodes_by_day', 'active_nodes_by_week', 'active_nodes_by_month',
+        'new_nodes', 'total_blocks', 'blocks_by_hour', 'blocks_by_day', 'total_trans', 'total_tps',
+        'trans_per_day', 'tps_per_day', 'avg_latency', 'latency_per_day',
+    ],
+    'swaps': [
+        'total_swaps', 'swap_activity', 'top_traders_1', 'top_traders_2', 'near_swaps',
+        'near_swaps_volume', 'near_swappers', 'top_near_swappers_1', 'top_near_swappers_2',
+    ],
+    'fees': ['near_fees', 'fees', 'avg_fee_per_tx', 'daily_fees'],
+    'staking': ['total_pools', 'validators', 'pools', 'stakes', 'stakes_over_time', 'validators_over_time'],
+}
+
+# Tab labels of the sections below the price chart, in page order.
+TABS = {
+    "**Metrics**": 'metrics',
+    "**Swaps**": 'swaps',
+    "**GAS & Fees**": 'fees',
+    "**Staking**": 'staking',
+}
+
+# Row keys of the time-series queries whose history is kept locally; the
+# first key is the time column. Panels sharing a query ID are listed once.
+SERIES = {
+    'hourly_price': ['HOUR', 'BLOCKCHAIN'],
+    'active_nodes_by_day': ['DAY'],
+    'active_nodes_by_week': ['DAY'],
+    'active_nodes_by_month': ['DAY'],
+    'new_nodes': ['Join date'],
+    'blocks_by_hour': ['TIME'],
+    'blocks_by_day': ['TIME'],
+    'trans_per_day': ['DAY'],
+    'latency_per_day': ['DAY'],
+    'swap_activity': ['DAY'],
+    'fees': ['DAY'],
+    'daily_fees': ['DAY'],
+    'stakes_over_time': ['DATE', 'ACTION'],
+    'validators_over_time': ['DATE'],
+}
+_SERIES_KEYS = {QUERIES[name]: keys for name, keys in SERIES.items()}
+_NAMES = {}
+for _name, _query_id in QUERIES.items():
+    _NAMES.setdefault(_query_id, _name)
+
+# Column types of each result (see ``dashboard.decode``), listed once per query
+# ID like ``SERIES``. Headline values keep float64; chart series use float32
+# where the precision loss cannot show.
+SCHEMAS = {
+    'current_price': {'HOURLY_PRICE': 'float64'},
+    'hourly_price': {'BLOCKCHAIN': 'category', 'HOUR': 'datetime', 'HOURLY_PRICE': 'float32'},
+    'total_active_nodes': {'TOTAL_NODES_COUNT': 'int'},
+    'active_nodes_by_day': {'DAY': 'datetime', 'NO_OF_ACTIVE_NODES': 'int'},
+    'active_nodes_by_week': {'DAY': 'datetime', 'NO_OF_ACTIVE_NODES': 'int'},
+    'active_nodes_by_month': {'DAY': 'datetime', 'NO_OF_ACTIVE_NODES': 'int'},
+    'new_nodes': {'Join date': 'datetime', 'Cumulative': 'int', 'New Wallets': 'int'},
+    'total_blocks': {'TOTAL_BLOCKS_COUNT': 'int'},
+    'blocks_by_hour': {'TIME': 'datetime', 'TOTAL_BLOCKS_COUNT': 'int'},
+    'blocks_by_day': {'TIME': 'datetime', 'TOTAL_BLOCKS_COUNT': 'int'},
+    'total_trans': {'TOTAL_NO_OF_TRANS': 'int', 'TPS': 'float64'},
+    'trans_per_day': {'DAY': 'datetime', 'NO_OF_TRANS': 'int', 'TPS': 'float32'},
+    'avg_latency': {'LATENCY': 'float64'},
+    'latency_per_day': {'DAY': 'datetime', 'LATENCY': 'float32'},
+    'total_swaps': {'TOTAL_SWAPS': 'int', 'NO_OF_SWAPPERS': 'int'},
+    'swap_activity': {'DAY': 'datetime', 'TOTAL_SWAPS': 'int', 'NO_OF_SWAPPERS': 'int'},
+    'top_traders_1': {'SWAPPER': 'category', 'NO_OF_SWAPS': 'int'},
+    'top_traders_2': {'SWAPPER': 'category', 'TOTAL_SWAP_IN_VOLUME_USD': 'float64'},
+    'near_swaps': {'NO_OF_SWAPS_IN': 'int', 'NO_OF_SWAPS_OUT': 'int'},
+    'near_swaps_volume': {'SWAP_IN_VOLUME_USD': 'float64', 'SWAP_OUT_VOLUME_USD': 'float64'},
+    'near_swappers': {'NO_OF_SWAPPERS_IN': 'int', 'NO_OF_SWAPPERS_OUT': 'int'},
+    'top_near_swappers_1': {'SWAPPER': 'category', 'SWAP_IN_VOLUME_USD': 'float64'},
+    'top_near_swappers_2': {'SWAPPER': 'category', 'SWAP_OUT_VOLUME_USD': 'float64'},
+    'near_fees': {'TOTAL_TRANSACTION_FEE': 'float64', 'TOTAL_TRANS_FEE_USD': 'float64', 'TOTAL_GAS_USED': 'int'},
+    'fees': {'DAY': 'datetime', 'TOTAL_TRANS_FEE_USD': 'float32', 'TOTAL_GAS_USED': 'int'},
+    'avg_fee_per_tx': {'AVG_FEE_PER_TX': 'float64', 'AVG_FEE_PER_TRADER': 'float64'},
+    'daily_fees': {'DAY': 'datetime', 'AVG_FEE_PER_TX': 'float32', 'AVG_FEE_PER_TRADER': 'float32'},
+    'total_pools': {'TOTAL_NO_OF_POOLS': 'int'},
+    'validators': {'NO_OF_VALIDATORS': 'int', 'MIN_POOL': 'float64', 'MAX_POOL': 'float64', 'MEDIAN_POOL': 'float64'},
+    'stakes': {'ACTION': 'category', 'TX_COUNT': 'int', 'VOLUME': 'float64'},
+    'stakes_over_time': {'DATE': 'datetime', 'ACTION': 'category', 'TX_COUNT': 'int', 'VOLUME': 'float32'},
+    'validators_over_time': {'DATE': 'datetime', 'VALIDATOR': 'int'},
+}
+_SCHEMAS = {QUERIES[name]: schema for name, schema in SCHEMAS.items()}
+
+
+def query_url(query_id):
+    return API_URL.format(query_id)
+
+
+def query_name(query_id):
+    """Return the first panel name registered for ``query_id``."""
+    return _NAMES.get(query_id, query_id)
+
+
+def series_keys(query_id):
+    """Return the row keys of a time-series query, or ``None`` for other queries."""
+    return _SERIES_KEYS.get(query_id)
+
+
+def schema(query_id):
+    return _SCHEMAS.get(query_id)
@@ -0,0 +1,88 @@
+"""Guards for calls to the upstream API.
+
+``TokenBucket`` spaces requests out to stay under the API's rate limit,
+``backoff()`` spreads retries with full jitter so failing clients do not
+retry in lockstep, and ``CircuitBreaker`` stops calling a query that keeps
+failing until it has had time to recover.
+"""
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second on average, in bursts of up to ``burst``."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def backoff(attempt, base=0.5, cap=8.0):
+    """Seconds to wait before retry number ``attempt`` (from 0): full jitter over an exponential ceiling."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitOpen(Exception):
+    """The query failed too often recently and is not being called."""
+
+
+class CircuitBreaker:
+    """Open after ``threshold`` consecutive failures and let one trial call through ``reset_after`` seconds later.
+
+    A successful trial closes the circuit again; a failed one keeps it open
+    for another ``reset_after`` seconds.
+    """
+
+    def __init__(self, threshold=3, reset_after=60.0):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return 'closed'
+        return 'half-open' if self._trial else 'open'
+
+    def allow(self):
+        """Whether a call may go ahead now; claims the trial call when the circuit is ready to close."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self._opened_at < self.reset_after:
+                return False
+            self._trial = True
+            return True
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self._opened_at = time.monotonic()
+            self._trial = False
@@ -0,0 +1,73 @@
+"""Coarser time buckets of additive series, derived locally.
+
+Counts, fees, gas and volumes add up across time, so one cached base series
+can be resampled into any coarser bucket instead of fetching a separate
+Flipside query per granularity. Each bucket is computed once per base
+result and cached with it in the result store, where it counts towards the
+store's byte budget. Distinct counts (such as active nodes) do not add up
+and keep their dedicated queries.
+
+A bucket is only reported when the base series covers all of it: buckets
+over a gap in the base, and partial ones at its edges (such as the current
+week), are left out rather than shown as zero or undercounted.
+"""
+import pandas as pd
+
+from dashboard import fetch, profiling
+
+# Weeks start on Monday, like Flipside's ``date_trunc('week', ...)``.
+BUCKETS = {
+    "By Hour": 'h',
+    "By Day": 'D',
+    "By Week": 'W-MON',
+    "By Month": 'MS',
+}
+
+
+def _grouper(time_column, bucket):
+    return pd.Grouper(key=time_column, freq=BUCKETS[bucket], closed='left', label='left')
+
+
+class Rollup:
+    def __init__(self, name, frame, time_column, columns, base, by=()):
+        # ``base`` is the bucket (a key of ``BUCKETS``) of one row of ``frame``.
+        self.name = name
+        self.frame = frame
+        self.time_column = time_column
+        self.columns = list(columns)
+        self.base = base
+        self.by = list(by)
+
+    def __call__(self, bucket):
+        """Return the base series summed into ``bucket`` (a key of ``BUCKETS``)."""
+        key = ('rollup', self.time_column, tuple(self.columns), tuple(self.by), self.base, bucket)
+        return fetch.derived(self.name, self.frame, key, lambda frame: self._resample(frame, bucket))
+
+    def _resample(self, frame, bucket):
+        with profiling.panel_timed('transform'):
+            groups = frame.groupby([_grouper(self.time_column, bucket), *self.by], observed=True, sort=True)
+            sums = groups[self.columns].sum(min_count=1).dropna(how='all')
+            # min_count turns integer columns to float to hold the empty buckets.
+            sums = sums.astype({
+                column: frame[column].dtype for column in self.columns if not sums[column].isna().any()
+            })
+            complete = self._complete(frame, bucket)
+            return sums[sums.index.get_level_values(0).isin(complete)].reset_index()
+
+    def _complete(self, frame, bucket):
+        """The start of every bucket that has a row for each base period in it."""
+        covered = frame.groupby(_grouper(self.time_column, bucket))[self.time_column].nunique()
+        if covered.empty:
+            return covered.index
+        periods = pd.date_range(
+            covered.index[0], covered.index[-1] + pd.tseries.frequencies.to_offset(BUCKETS[bucket]),
+            freq=BUCKETS[self.base], inclusive='left',
+        )
+        expected = pd.Series(1, index=periods).groupby(_grouper(None, bucket)).sum()
+        expected = expected.reindex(covered.index, fill_value=0)
+        return covered.index[(covered >= expected) & (covered > 0)]
+
+
+def rollup(name, frame, time_column, columns, base, by=()):
+    """Return the ``Rollup`` of ``frame``, the result of query ``name`` with one row per ``base`` bucket."""
+    return Rollup(name, frame, time_column, columns, base, by)
@@ -0,0 +1,89 @@
+"""Background refresh of every registered query.
+
+The scheduler runs on a daemon thread inside the Streamlit server process and
+re-downloads each query shortly before its cached result expires, so pages
+rarely wait on Flipside. A result's age is taken from memory or, once the
+store has evicted it, from its disk file: an evicted result is refreshed when
+it goes stale, never reloaded just to keep it in memory. Its downloads are
+shared with the refreshes pages start (``fetch.download`` is single-flight).
+Refresh times are jittered to spread the downloads out, at most
+``max_concurrency`` downloads run at once, and each round of refreshed
+results is published to the store as one atomic snapshot.
+"""
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dashboard import fetch, queries
+
+logger = logging.getLogger(__name__)
+
+# Retry failed refreshes after 5 minutes.
+RETRY_DELAY = 5 * 60
+# Upper bound on how long the scheduler sleeps between checks.
+POLL_INTERVAL = 60
+
+
+class RefreshScheduler:
+    def __init__(self, interval=None, jitter=0.1, max_concurrency=4):
+        self.interval = fetch.disk_cache.ttl if interval is None else interval
+        self.jitter = jitter
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='flipside-refresh')
+        self._thread = threading.Thread(target=self._run, name='refresh-scheduler', daemon=True)
+        self._stopped = threading.Event()
+        # query_id -> (fetched_at, due_at), so each result gets one jittered deadline.
+        self._due = {}
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        self._pool.shutdown()
+
+    def due_at(self, query_id):
+        entry = fetch.store.snapshot().get(query_id)
+        fetched_at = fetch._saved_at(query_id) if entry is None else entry[1]
+        due = self._due.get(query_id)
+        if due is None or due[0] != fetched_at:
+            if fetched_at is None:
+                due = (None, 0)
+            else:
+                # Refresh a little before the entry expires rather than after.
+                due = (fetched_at, fetched_at + self.interval * (1 - random.uniform(0, self.jitter)))
+            self._due[query_id] = due
+        return due[1]
+
+    def refresh(self, query_ids):
+        """Refresh ``query_ids`` concurrently and publish the results together."""
+        futures = {
+            query_id: self._pool.submit(self._refresh_one, query_id, self._due.get(query_id, (None,))[0])
+            for query_id in query_ids
+        }
+        results = {}
+        for query_id, future in futures.items():
+            try:
+                results[query_id] = future.result()
+            except Exception:
+                logger.exception('Scheduled refresh of query %s failed', query_id)
+                self._due[query_id] = (self._due[query_id][0], time.time() + RETRY_DELAY)
+        fetch.store.publish(results)
+
+    def _refresh_one(self, query_id, fetched_at):
+        # Relative to the result that was due, so a page-triggered refresh that
+        # got there first is read back instead of downloaded again.
+        return fetch.download(query_id, since=fetched_at)
+
+    def _run(self):
+        query_ids = sorted(set(queries.QUERIES.values()))
+        while not self._stopped.is_set():
+            now = time.time()
+            deadlines = {query_id: self.due_at(query_id) for query_id in query_ids}
+            due = [query_id for query_id, due_at in deadlines.items() if due_at <= now]
+            if due:
+                self.refresh(due)
+                continue
+            self._stopped.wait(min(min(deadlines.values()) - now, POLL_INTERVAL))
@@ -0,0 +1,147 @@
+"""Process-wide in-memory store of query results.
+
+Every Streamlit session and every panel shares the same result object for a
+query ID. Loads are single-flight: concurrent requests for a query that is
+not in memory yet wait on one in-flight load instead of starting their own.
+Results are shared, so callers must treat the returned frames as read-only.
+
+The result mapping is copy-on-write: updates publish a new dict in one
+assignment, so ``snapshot()`` is a consistent view that never changes under
+a reader.
+
+The store keeps to a byte budget (see ``dashboard.memory``). Entries evicted
+to make room are handed to ``spill`` first, so the loader can read them back
+from disk on their next use.
+
+Values derived from an entry, such as a resampled series, are cached with it
+through ``derived()``: their bytes count towards the entry's size, and they
+are dropped when the entry is replaced or evicted.
+"""
+import threading
+import time
+from concurrent.futures import Future
+from types import MappingProxyType
+
+from dashboard import profiling
+from dashboard.memory import frame_bytes, victims
+
+
+class ResultStore:
+    def __init__(self, loader, budget, spill=None):
+        # ``loader(query_id)`` returns ``(frame, fetched_at)``;
+        # ``spill(query_id, frame)`` persists an entry about to be evicted.
+        self._loader = loader
+        self._spill = spill
+        self.budget = budget
+        self._results = {}
+        self._inflight = {}
+        self._sizes = {}
+        self._last_used = {}
+        # query_id -> {key: (value, nbytes)} of values derived from the entry.
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def get(self, query_id):
+        """Return ``(frame, fetched_at)`` for ``query_id``, loading it once if needed."""
+        with self._lock:
+            if query_id in self._results:
+                self._last_used[query_id] = time.monotonic()
+                return self._results[query_id]
+            future = self._inflight.get(query_id)
+            leader = future is None
+            if leader:
+                future = self._inflight[query_id] = Future()
+        if leader:
+            try:
+                result = self._loader(query_id)
+            except BaseException as exc:
+                with self._lock:
+                    del self._inflight[query_id]
+                future.set_exception(exc)
+                raise
+            self.publish({query_id: result})
+            with self._lock:
+                del self._inflight[query_id]
+            future.set_result(result)
+        return future.result()
+
+    def put(self, query_id, frame, fetched_at):
+        self.publish({query_id: (frame, fetched_at)})
+
+    def publish(self, results):
+        """Atomically replace the entries in ``results`` (``{query_id: (frame, fetched_at)}``).
+
+        An entry older than the one already in the store is ignored, so a slow
+        refresh cannot undo a newer one that finished first, and so is the
+        frame already stored, whose derived values stay valid.
+        """
+        sizes = {query_id: frame_bytes(frame) for query_id, (frame, _) in results.items()}
+        now = time.monotonic()
+        with self._lock:
+            results = {
+                query_id: result for query_id, result in results.items()
+                if query_id not in self._results
+                or (result[1] >= self._results[query_id][1] and result[0] is not self._results[query_id][0])
+            }
+            self._sizes.update({query_id: sizes[query_id] for query_id in results})
+            self._last_used.update(dict.fromkeys(results, now))
+            for query_id in results:
+                self._derived.pop(query_id, None)
+            merged = {**self._results, **results}
+            # A lone entry is kept even when it is over budget by itself; a batch
+            # from the scheduler competes for room like everything else.
+            evicted = self._evict(merged, keep=results if len(results) == 1 else ())
+            self._results = merged
+            used, entries = sum(self._sizes.values()), len(merged)
+        self._evicted(evicted, used, entries)
+
+    def derived(self, query_id, key, frame, build, nbytes):
+        """Return ``build(frame)``, cached under ``key`` with the entry of ``query_id``.
+
+        The value is only cached while ``frame`` is the entry in the store, and
+        ``nbytes(value)`` is added to the entry's size.
+        """
+        with self._lock:
+            entry = self._results.get(query_id)
+            cached = self._derived.get(query_id, {}).get(key)
+            if entry is not None and entry[0] is frame and cached is not None:
+                self._last_used[query_id] = time.monotonic()
+                return cached[0]
+        value = build(frame)
+        size = nbytes(value)
+        with self._lock:
+            entry = self._results.get(query_id)
+            if entry is None or entry[0] is not frame:
+                # Built from a result the store no longer holds: nothing to charge it to.
+                return value
+            self._derived.setdefault(query_id, {})[key] = (value, size)
+            self._sizes[query_id] += size
+            self._last_used[query_id] = time.monotonic()
+            results = dict(self._results)
+            evicted = self._evict(results, keep=(query_id,))
+            self._results = results
+            used, entries = sum(self._sizes.values()), len(results)
+        self._evicted(evicted, used, entries)
+        return value
+
+    def _evict(self, results, keep):
+        """Remove entries from ``results`` until the store fits its budget; the lock must be held."""
+        evicted = {}
+        for query_id in victims(self._sizes, self._last_used, self.budget, keep=keep):
+            evicted[query_id] = (results.pop(query_id)[0], self._sizes.pop(query_id))
+            del self._last_used[query_id]
+            self._derived.pop(query_id, None)
+        return evicted
+
+    def _evicted(self, evicted, used, entries):
+        for query_id, (frame, nbytes) in evicted.items():
+            if self._spill is not None:
+                self._spill(query_id, frame)
+            profiling.record('memory', 'results', 'evict', nbytes=nbytes)
+        profiling.set_memory('results', used, self.budget, entries)
+
+    def snapshot(self):
+        return MappingProxyType(self._results)
+
+    def __contains__(self, query_id):
+        return query_id in self._results
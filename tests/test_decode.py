@@ -0,0 +1,37 @@
+import json
+import logging
+
+import pandas as pd
+
+from dashboard.decode import apply_schema, decode, mismatches
+
+SCHEMA = {'DAY': 'datetime', 'LATENCY': 'float32', 'COUNT': 'int'}
+
+
+def _payload(latency):
+    return json.dumps([
+        {'DAY': '2024-01-01 00:00:00.000', 'LATENCY': latency, 'COUNT': 3},
+        {'DAY': '2024-01-02 00:00:00.000', 'LATENCY': 1.5, 'COUNT': 300},
+    ]).encode()
+
+
+def test_declared_types():
+    frame = decode(_payload(2.5), SCHEMA)
+    assert frame.dtypes.astype(str).to_dict() == {'DAY': 'datetime64[us]', 'LATENCY': 'float32', 'COUNT': 'int16'}
+
+
+def test_mismatched_column_is_inferred(caplog):
+    with caplog.at_level(logging.WARNING, logger='dashboard.decode'):
+        frame = decode(_payload('n/a'), SCHEMA)
+    assert frame['LATENCY'].tolist() == ['n/a', 1.5]
+    # The rest of the query keeps its declared types.
+    assert frame['COUNT'].dtype == 'int16'
+    assert 'LATENCY' in caplog.text
+    assert apply_schema(frame, SCHEMA)['LATENCY'].tolist() == ['n/a', 1.5]
+
+
+def test_mismatches():
+    assert mismatches(_payload(2.5), SCHEMA) == {}
+    errors = mismatches(_payload('n/a'), {**SCHEMA, 'MISSING': 'int'})
+    assert set(errors) == {'LATENCY', 'MISSING'}
+    assert isinstance(decode(b'[]', SCHEMA), pd.DataFrame)
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.downsample import downsample, lttb, window
+
+
+def test_lttb_keeps_the_ends_and_the_peaks():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[337], y[701] = 50.0, -50.0
+    indices = lttb(x, y, 20)
+    assert len(indices) == 20
+    assert indices[0] == 0 and indices[-1] == 999
+    assert (np.diff(indices) > 0).all()
+    assert {337, 701} <= set(indices.tolist())
+
+
+def test_lttb_leaves_short_series_alone():
+    assert lttb(np.arange(10), np.arange(10), 20).tolist() == list(range(10))
+
+
+def test_downsample_datetimes():
+    frame = pd.DataFrame({'DAY': pd.date_range('2024-01-01', periods=500), 'VALUE': np.sin(np.arange(500) / 10)})
+    sampled = downsample(frame, 'DAY', 'VALUE', threshold=50)
+    assert len(sampled) == 50
+    assert sampled['DAY'].is_monotonic_increasing
+
+
+def test_window_is_inclusive():
+    frame = pd.DataFrame({'DAY': pd.date_range('2024-01-01', periods=10)})
+    selected = window(frame, 'DAY', pd.Timestamp('2024-01-03').to_pydatetime(), pd.Timestamp('2024-01-05').to_pydatetime())
+    assert selected['DAY'].dt.day.tolist() == [3, 4, 5]
@@ -0,0 +1,83 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from dashboard import fetch
+from dashboard.cache import DiskCache
+
+QUERY_ID = fetch.queries.QUERIES['current_price']
+
+
+def _count_downloads(monkeypatch, tmp_path, delay=0.0):
+    monkeypatch.setattr(fetch, 'disk_cache', DiskCache(tmp_path))
+    monkeypatch.setattr(fetch, 'OFFLINE', False)
+    downloads = []
+    started = threading.Event()
+
+    def download(query_id):
+        downloads.append(query_id)
+        started.set()
+        time.sleep(delay)
+        frame = pd.DataFrame({'PRICE': [1.0]})
+        fetch.disk_cache.save(query_id, frame)
+        return frame, time.time()
+
+    monkeypatch.setattr(fetch, '_download', download)
+    return downloads, started
+
+
+def test_concurrent_downloads_share_one_request(monkeypatch, tmp_path):
+    downloads, started = _count_downloads(monkeypatch, tmp_path, delay=0.2)
+    with ThreadPoolExecutor(4) as pool:
+        leader = pool.submit(fetch.download, QUERY_ID)
+        started.wait()
+        followers = [pool.submit(fetch.download, QUERY_ID, since=0) for _ in range(3)]
+        results = [leader.result(), *(future.result() for future in followers)]
+    assert downloads == [QUERY_ID]
+    assert all(result is results[0] for result in results)
+
+
+def test_download_since_reads_back_a_newer_result(monkeypatch, tmp_path):
+    downloads, _ = _count_downloads(monkeypatch, tmp_path)
+    frame, fetched_at = fetch.download(QUERY_ID)
+    # A second refresh of the result that was stale before the first one.
+    cached, _ = fetch.download(QUERY_ID, since=fetched_at - 60)
+    assert downloads == [QUERY_ID]
+    assert cached['PRICE'].tolist() == frame['PRICE'].tolist()
+    fetch.download(QUERY_ID, since=fetched_at)
+    assert downloads == [QUERY_ID, QUERY_ID]
+
+
+def test_collect_reads_one_snapshot(monkeypatch):
+    old, new = pd.DataFrame({'PRICE': [1.0]}), pd.DataFrame({'PRICE': [2.0]})
+    store = fetch.ResultStore(lambda query_id: (old, 0.0), budget=1 << 20)
+    monkeypatch.setattr(fetch, 'store', store)
+    # The loaded entry is stale; keep load() from refreshing it from Flipside.
+    monkeypatch.setattr(fetch, 'OFFLINE', True)
+    pending = fetch.prefetch(['current_price'])
+    pending['current_price'].result()
+    # A refresh published after the load finished but before the page collected it.
+    store.put(QUERY_ID, new, 3600.0)
+    data = fetch.collect(pending)
+    assert data['current_price'] is new
+    assert data.as_of('current_price') == 'Data as of 1970-01-01 01:00 UTC'
+    assert data.as_of('hourly_price') is None
+
+
+def test_load_records_the_tier_that_served_it(monkeypatch, tmp_path):
+    _count_downloads(monkeypatch, tmp_path)
+    monkeypatch.setattr(fetch, 'store', fetch.ResultStore(fetch._load_uncached, budget=1 << 20))
+    tiers = []
+
+    def record(kind, name, phase, seconds=None, nbytes=None, cache=None):
+        if phase == 'load':
+            tiers.append(cache)
+
+    monkeypatch.setattr(fetch.profiling, 'record', record)
+    fetch.load(QUERY_ID)
+    fetch.load(QUERY_ID)
+    monkeypatch.setattr(fetch, 'store', fetch.ResultStore(fetch._load_uncached, budget=1 << 20))
+    fetch.load(QUERY_ID)
+    assert tiers == ['network', 'memory', 'disk']
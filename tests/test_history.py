@@ -0,0 +1,36 @@
+import pandas as pd
+
+from dashboard.history import SeriesStore
+
+QUERY_ID = 'series'
+KEYS = ['DAY']
+
+
+def _frame(days, values):
+    return pd.DataFrame({'DAY': pd.to_datetime(days), 'VALUE': values})
+
+
+def test_append_stores_only_new_or_changed_rows(tmp_path):
+    store = SeriesStore(tmp_path)
+    store.append(QUERY_ID, _frame(['2024-01-01', '2024-01-02'], [1, 2]), KEYS)
+    history = store.append(QUERY_ID, _frame(['2024-01-02', '2024-01-03'], [5, 3]), KEYS)
+    # The first day left the upstream window but stays in the history; the second changed.
+    assert history['VALUE'].tolist() == [1, 5, 3]
+    segments = sorted((tmp_path / QUERY_ID).glob('*.arrow'))
+    assert len(segments) == 2
+    assert len(pd.read_feather(segments[-1])) == 2
+
+
+def test_unchanged_download_writes_nothing(tmp_path):
+    store = SeriesStore(tmp_path)
+    frame = _frame(['2024-01-01', '2024-01-02'], [1, 2])
+    store.append(QUERY_ID, frame, KEYS)
+    assert store.append(QUERY_ID, frame, KEYS)['VALUE'].tolist() == [1, 2]
+    assert len(list((tmp_path / QUERY_ID).glob('*.arrow'))) == 1
+
+
+def test_new_columns_start_the_history_over(tmp_path):
+    store = SeriesStore(tmp_path)
+    store.append(QUERY_ID, _frame(['2024-01-01'], [1]), KEYS)
+    frame = _frame(['2024-01-02'], [2]).assign(OTHER=1)
+    assert store.append(QUERY_ID, frame, KEYS)['DAY'].tolist() == [pd.Timestamp('2024-01-02')]
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from dashboard import price
+from dashboard.price import PriceSeries, _minmax_halve
+
+
+def test_minmax_halve_keeps_extremes_in_time_order():
+    hours = np.arange(10)
+    prices = np.array([5, 1, 9, 3, 4, 8, 2, 6, 7, 0], dtype=float)
+    kept_hours, kept_prices = _minmax_halve(hours, prices)
+    # Buckets of 4 keep their min and max; the 2 left over are kept as they are.
+    assert kept_hours.tolist() == [1, 2, 5, 6, 8, 9]
+    assert kept_prices.tolist() == [1, 9, 8, 2, 7, 0]
+
+
+def _hourly(count):
+    hours = pd.date_range('2024-01-01', periods=count, freq='h')
+    prices = np.random.default_rng(0).uniform(1, 10, count)
+    prices[count // 2] = 100.0
+    return pd.DataFrame({'HOUR': hours[::-1], 'BLOCKCHAIN': 'NEAR', 'HOURLY_PRICE': prices[::-1]})
+
+
+def test_levels_halve_until_they_fit(monkeypatch):
+    monkeypatch.setattr(price, 'MAX_POINTS', 100)
+    series = PriceSeries(_hourly(1000))
+    sizes = [len(hours) for hours, _ in series.levels]
+    assert sizes[0] == 1000 and sizes[-1] <= 100
+    assert all(later <= earlier // 2 + 2 for earlier, later in zip(sizes, sizes[1:]))
+    for hours, prices in series.levels:
+        assert (np.diff(hours) > np.timedelta64(0)).all()
+        assert prices.max() == 100.0
+
+
+def test_window_slices_and_downsamples(monkeypatch):
+    monkeypatch.setattr(price, 'MAX_POINTS', 100)
+    series = PriceSeries(_hourly(1000))
+    now = pd.Timestamp('2024-01-01') + pd.Timedelta(hours=999)
+    day = series._window('24 Hours', now.to_pydatetime())
+    # Both ends of the range are included.
+    assert len(day) == 25
+    everything = series._window('All Time', now.to_pydatetime())
+    assert len(everything) <= 100
+    assert everything['HOURLY_PRICE'].max() == 100.0
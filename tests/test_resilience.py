@@ -0,0 +1,76 @@
+import pytest
+import requests
+
+from dashboard import fetch
+from dashboard.resilience import CircuitBreaker, CircuitOpen
+
+
+def test_half_open_trial_closes_on_success():
+    circuit = CircuitBreaker(threshold=1, reset_after=0)
+    circuit.failure()
+    assert circuit.state == 'open'
+    assert circuit.allow()
+    assert circuit.state == 'half-open'
+    # Only one trial call at a time.
+    assert not circuit.allow()
+    circuit.success()
+    assert circuit.state == 'closed'
+    assert circuit.allow()
+
+
+def test_half_open_trial_reopens_on_failure():
+    circuit = CircuitBreaker(threshold=1, reset_after=60)
+    circuit.failure()
+    circuit.reset_after = 0
+    assert circuit.allow()
+    circuit.reset_after = 60
+    circuit.failure()
+    assert circuit.state == 'open'
+    assert not circuit.allow()
+
+
+def _trip(monkeypatch, query_id, error):
+    circuit = CircuitBreaker(threshold=1, reset_after=0)
+    circuit.failure()
+    monkeypatch.setitem(fetch._breakers, query_id, circuit)
+
+    def get(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(fetch._session, 'get', get)
+    monkeypatch.setattr(fetch, 'backoff', lambda attempt: 0)
+    return circuit
+
+
+def test_unexpected_request_error_resolves_trial(monkeypatch):
+    query_id = fetch.queries.QUERIES['current_price']
+    circuit = _trip(monkeypatch, query_id, requests.exceptions.InvalidURL('bad url'))
+    with pytest.raises(requests.exceptions.InvalidURL):
+        fetch._get(query_id)
+    assert circuit.state == 'open'
+    # The trial was given back, so the circuit can be tried again later.
+    assert circuit.allow()
+
+
+def test_truncated_body_is_retried(monkeypatch):
+    query_id = fetch.queries.QUERIES['current_price']
+    attempts = []
+
+    def get(*args, **kwargs):
+        attempts.append(1)
+        raise requests.exceptions.ChunkedEncodingError('truncated')
+
+    circuit = _trip(monkeypatch, query_id, None)
+    monkeypatch.setattr(fetch._session, 'get', get)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        fetch._get(query_id)
+    assert len(attempts) == fetch.MAX_ATTEMPTS
+    assert circuit.state == 'open'
+
+
+def test_open_circuit_is_not_called(monkeypatch):
+    query_id = fetch.queries.QUERIES['current_price']
+    circuit = _trip(monkeypatch, query_id, AssertionError('called'))
+    circuit.reset_after = 60
+    with pytest.raises(CircuitOpen):
+        fetch._get(query_id)
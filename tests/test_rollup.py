@@ -0,0 +1,64 @@
+import pandas as pd
+
+from dashboard.rollup import rollup
+
+
+def _daily(days, values=None):
+    days = pd.to_datetime(days)
+    return pd.DataFrame({'DAY': days, 'COUNT': values if values is not None else [1] * len(days)})
+
+
+def _sum(frame, bucket, base='By Day', by=()):
+    return rollup('trans_per_day', frame, 'DAY', ['COUNT'], base, by=by)(bucket)
+
+
+def test_weeks_start_on_monday():
+    # Monday 2024-01-01 to Sunday 2024-01-14: two full weeks.
+    frame = _daily(pd.date_range('2024-01-01', '2024-01-14'), list(range(14)))
+    weeks = _sum(frame, 'By Week')
+    assert weeks['DAY'].tolist() == [pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-08')]
+    assert weeks['COUNT'].tolist() == [sum(range(7)), sum(range(7, 14))]
+    assert weeks['COUNT'].dtype == frame['COUNT'].dtype
+
+
+def test_gaps_are_not_zero():
+    frame = _daily(['2024-01-01', '2024-01-02', '2024-01-04'])
+    days = _sum(frame, 'By Day')
+    assert days['DAY'].tolist() == list(pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-04']))
+    assert (days['COUNT'] > 0).all()
+    # The week with the missing day is not reported as complete.
+    assert _sum(_daily(pd.date_range('2024-01-01', '2024-01-14').delete(3)), 'By Week')['DAY'].tolist() == [
+        pd.Timestamp('2024-01-08'),
+    ]
+
+
+def test_partial_edge_buckets_are_left_out():
+    # Wednesday 2024-01-03 to Wednesday 2024-02-14.
+    frame = _daily(pd.date_range('2024-01-03', '2024-02-14'))
+    weeks = _sum(frame, 'By Week')
+    assert weeks['DAY'].iloc[0] == pd.Timestamp('2024-01-08')
+    assert weeks['DAY'].iloc[-1] == pd.Timestamp('2024-02-05')
+    assert (weeks['COUNT'] == 7).all()
+    assert _sum(frame, 'By Month').empty
+    months = _sum(_daily(pd.date_range('2024-01-01', '2024-02-14')), 'By Month')
+    assert months['DAY'].tolist() == [pd.Timestamp('2024-01-01')]
+    assert months['COUNT'].tolist() == [31]
+
+
+def test_weekly_base_into_months():
+    # Every Monday of February 2024, and the first of March's four.
+    frame = _daily(pd.date_range('2024-02-05', '2024-03-04', freq='W-MON'))
+    months = _sum(frame, 'By Month', base='By Week')
+    assert months['DAY'].tolist() == [pd.Timestamp('2024-02-01')]
+    assert months['COUNT'].tolist() == [4]
+    assert _sum(frame.iloc[1:], 'By Month', base='By Week').empty
+
+
+def test_groups_without_rows_in_a_covered_bucket():
+    frame = pd.DataFrame({
+        'DAY': pd.to_datetime(['2024-01-01', '2024-01-01', '2024-01-02']),
+        'ACTION': pd.Categorical(['Stake', 'Unstake', 'Stake']),
+        'COUNT': [1, 2, 3],
+    })
+    days = _sum(frame, 'By Day', by=['ACTION'])
+    assert days[['ACTION', 'COUNT']].values.tolist() == [['Stake', 1], ['Unstake', 2], ['Stake', 3]]
@@ -0,0 +1,24 @@
+import time
+
+import pandas as pd
+
+from dashboard import fetch
+from dashboard.cache import DiskCache
+from dashboard.scheduler import RefreshScheduler
+
+QUERY_ID = fetch.queries.QUERIES['current_price']
+
+
+def test_evicted_fresh_result_is_not_due(monkeypatch, tmp_path):
+    monkeypatch.setattr(fetch, 'disk_cache', DiskCache(tmp_path, ttl=3600))
+    monkeypatch.setattr(fetch, 'store', fetch.ResultStore(fetch._load_uncached, budget=1 << 20))
+    fetch.disk_cache.save(QUERY_ID, pd.DataFrame({'PRICE': [1.0]}))
+    scheduler = RefreshScheduler()
+    # Not in memory, but its disk copy is fresh: due when that expires.
+    assert scheduler.due_at(QUERY_ID) > time.time() + 3000
+
+
+def test_missing_result_is_due_now(monkeypatch, tmp_path):
+    monkeypatch.setattr(fetch, 'disk_cache', DiskCache(tmp_path, ttl=3600))
+    monkeypatch.setattr(fetch, 'store', fetch.ResultStore(fetch._load_uncached, budget=1 << 20))
+    assert RefreshScheduler().due_at(QUERY_ID) <= time.time()
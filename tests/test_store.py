@@ -0,0 +1,50 @@
+import pandas as pd
+
+from dashboard.memory import frame_bytes
+from dashboard.store import ResultStore
+
+
+def _frame(rows):
+    return pd.DataFrame({'VALUE': range(rows)})
+
+
+def test_derived_values_are_charged_to_their_entry():
+    store = ResultStore(lambda query_id: (_frame(100), 0.0), budget=1 << 20)
+    frame, _ = store.get('a')
+    builds = []
+
+    def build(frame):
+        builds.append(1)
+        return frame.head(10)
+
+    value = store.derived('a', 'head', frame, build, frame_bytes)
+    assert store.derived('a', 'head', frame, build, frame_bytes) is value
+    assert builds == [1]
+    assert store._sizes['a'] == frame_bytes(frame) + frame_bytes(value)
+
+
+def test_derived_values_go_with_their_entry():
+    store = ResultStore(lambda query_id: (_frame(1000), 0.0), budget=1 << 20)
+    frame, _ = store.get('a')
+    store.derived('a', 'head', frame, lambda frame: frame.head(10), frame_bytes)
+    # Replaced: the old value is dropped, and one built from the old frame is not cached.
+    store.put('a', _frame(1000), 1.0)
+    assert 'a' not in store._derived
+    store.derived('a', 'head', frame, lambda frame: frame.head(10), frame_bytes)
+    assert 'a' not in store._derived
+    # Evicted: the derived value leaves with the entry.
+    frame, _ = store.get('a')
+    store.derived('a', 'head', frame, lambda frame: frame.head(10), frame_bytes)
+    store.budget = frame_bytes(frame) * 3 // 2
+    store.put('b', _frame(1000), 0.0)
+    assert 'a' not in store
+    assert 'a' not in store._derived
+    assert sum(store._sizes.values()) <= store.budget
+
+
+def test_republishing_the_stored_frame_keeps_derived_values():
+    store = ResultStore(lambda query_id: (_frame(100), 0.0), budget=1 << 20)
+    frame, fetched_at = store.get('a')
+    store.derived('a', 'head', frame, lambda frame: frame.head(10), frame_bytes)
+    store.publish({'a': (frame, fetched_at)})
+    assert 'head' in store._derived['a']